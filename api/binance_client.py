@@ -1,10 +1,10 @@
 """Binance Futures WebSocket client for volatility monitoring."""
-import json
 import asyncio
 import logging
 import time
 from typing import Optional, Callable
 
+import orjson
 import websockets
 from websockets.client import WebSocketClientProtocol
 
@@ -87,7 +87,7 @@ class BinanceWSClient:
                                 message = await asyncio.wait_for(ws.recv(), timeout=1.0)
                             except asyncio.TimeoutError:
                                 continue  # Check _running and retry
-                            data = json.loads(message)
+                            data = orjson.loads(message)
                             self._msg_count += 1
                             
                             # Handle combined stream format or flat format
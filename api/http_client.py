@@ -1,12 +1,13 @@
 """HTTP client for StandX Perps API."""
-import json
 import time
 import logging
 from typing import Optional, List
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 
 import httpx
+import orjson
 
 from .auth import StandXAuth
 
@@ -14,7 +15,7 @@ from .auth import StandXAuth
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class Order:
     """Represents an open order."""
     id: int
@@ -26,9 +27,24 @@ class Order:
     symbol: str
     realized_pnl: float = 0.0
     updated_at: str = ""
+    updated_ts: float = 0.0  # updated_at as a Unix timestamp, 0.0 if missing/unparseable
 
 
-@dataclass 
+@lru_cache(maxsize=1024)
+def _iso_to_ts(value: str) -> float:
+    """Convert an ISO-8601 timestamp (e.g. '2024-01-01T00:00:00Z') to Unix seconds.
+    
+    Cached: periodic history queries return mostly the same orders each time.
+    """
+    if not value:
+        return 0.0
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return 0.0
+
+
+@dataclass(slots=True)
 class Position:
     """Represents a position."""
     qty: float
@@ -44,7 +60,11 @@ class StandXHTTPClient:
     
     def __init__(self, auth: StandXAuth, latency_log_file: str = None):
         self._auth = auth
-        self._client = httpx.AsyncClient(timeout=10.0)  # Reduced from 30s for faster shutdown
+        self._client = httpx.AsyncClient(
+            timeout=10.0,  # Reduced from 30s for faster shutdown
+            # Keep pooled TLS connections alive across quiet periods (httpx default expiry is 5s)
+            limits=httpx.Limits(max_connections=8, max_keepalive_connections=8, keepalive_expiry=60.0),
+        )
         self._latency_log_file = latency_log_file
     
     def set_latency_log_file(self, filepath: str):
@@ -194,6 +214,7 @@ class StandXHTTPClient:
         items = response if isinstance(response, list) else response.get("result", [])
         
         for item in items:
+            updated_at = item.get("updated_at", "")
             orders.append(Order(
                 id=item["id"],
                 cl_ord_id=item.get("cl_ord_id", ""),
@@ -203,7 +224,8 @@ class StandXHTTPClient:
                 status=item["status"],
                 symbol=item["symbol"],
                 realized_pnl=float(item.get("realized_pnl", 0)),
-                updated_at=item.get("updated_at", ""),
+                updated_at=updated_at,
+                updated_ts=_iso_to_ts(updated_at),
             ))
         return orders
     
@@ -271,12 +293,12 @@ class StandXHTTPClient:
         
         response = await self._client.get(url, params=params, headers=headers)
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     
     async def _post(self, path: str, payload: dict, sign: bool = False) -> dict:
         """Make a POST request with latency tracking."""
         url = f"{self.BASE_URL}{path}"
-        payload_str = json.dumps(payload)
+        payload_str = orjson.dumps(payload).decode()
         
         if sign:
             headers = self._auth.get_auth_headers(payload_str)
@@ -295,7 +317,7 @@ class StandXHTTPClient:
         
         response.raise_for_status()
         
-        result = response.json()
+        result = orjson.loads(response.content)
         logger.info(f"[Latency] {path} responded in {latency_ms:.0f}ms")
         
         # Write latency to log file
@@ -23,42 +23,49 @@ class TelegramBot:
         self.base_url = f"https://api.telegram.org/bot{token}"
         self.offset = 0
         self.running = False
+        # One pooled client for polling and replies, so each request reuses
+        # the open TLS connection to api.telegram.org. Owned by run().
+        self._client: Optional[httpx.AsyncClient] = None
         
     async def run(self):
         """Start the bot polling loop."""
         logger.info("Starting Telegram Bot polling...")
         self.running = True
+        self._client = httpx.AsyncClient(timeout=30)
         
-        while self.running:
-            try:
-                updates = await self.get_updates()
-                for update in updates:
-                    await self.process_update(update)
-                    # Update offset to confirm receipt
-                    self.offset = update["update_id"] + 1
+        try:
+            while self.running:
+                try:
+                    updates = await self.get_updates()
+                    for update in updates:
+                        await self.process_update(update)
+                        # Update offset to confirm receipt
+                        self.offset = update["update_id"] + 1
                     
-                # Short sleep to avoid busy loop if no updates/error
-                await asyncio.sleep(1)
+                    # Short sleep to avoid busy loop if no updates/error
+                    await asyncio.sleep(1)
                 
-            except asyncio.CancelledError:
-                logger.info("Telegram Bot stopped.")
-                break
-            except Exception as e:
-                logger.error(f"Telegram polling error: {e}")
-                await asyncio.sleep(5) # Backoff on error
+                except asyncio.CancelledError:
+                    logger.info("Telegram Bot stopped.")
+                    break
+                except Exception as e:
+                    logger.error(f"Telegram polling error: {e}")
+                    await asyncio.sleep(5) # Backoff on error
+        finally:
+            await self._client.aclose()
+            self._client = None
 
     async def get_updates(self):
         """Long-poll for new updates."""
         try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                response = await client.get(
-                    f"{self.base_url}/getUpdates",
-                    params={"offset": self.offset, "timeout": 20}
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get("ok"):
-                        return data.get("result", [])
+            response = await self._client.get(
+                f"{self.base_url}/getUpdates",
+                params={"offset": self.offset, "timeout": 20}
+            )
+            if response.status_code == 200:
+                data = response.json()
+                if data.get("ok"):
+                    return data.get("result", [])
         except httpx.ReadTimeout:
             pass # Normal timeout
         except Exception:
@@ -118,15 +125,15 @@ class TelegramBot:
     async def send_message(self, chat_id: str, text: str):
         """Send a message to a chat."""
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                await client.post(
-                    f"{self.base_url}/sendMessage",
-                    json={
-                        "chat_id": chat_id,
-                        "text": text,
-                        "parse_mode": "Markdown"
-                    }
-                )
+            await self._client.post(
+                f"{self.base_url}/sendMessage",
+                json={
+                    "chat_id": chat_id,
+                    "text": text,
+                    "parse_mode": "Markdown"
+                },
+                timeout=10,
+            )
         except Exception as e:
             logger.error(f"Failed to send Telegram message: {e}")
 
@@ -7,10 +7,13 @@ Handles two WebSocket connections:
 Both clients support auto-reconnection.
 """
 import json
+import time
+import uuid
 import asyncio
 import logging
 from typing import Optional, Callable
 
+import orjson
 import websockets
 from websockets.client import WebSocketClientProtocol
 
@@ -95,11 +98,10 @@ class MarketWSClient:
                     message = await asyncio.wait_for(self._ws.recv(), timeout=1.0)
                 except asyncio.TimeoutError:
                     continue  # Check _running and retry
-                data = json.loads(message)
+                data = orjson.loads(message)
                 self._msg_count += 1
                 
                 # Log heartbeat every 10 seconds
-                import time
                 now = time.time()
                 if now - self._last_log_time >= 10:
                     logger.info(f"[Heartbeat] Market WS alive, {self._msg_count} msgs total")
@@ -107,7 +109,7 @@ class MarketWSClient:
                 
                 # Handle server ping (JSON-based)
                 if data.get("ping"):
-                    await self._ws.send(json.dumps({"pong": data["ping"]}))
+                    await self._ws.send(orjson.dumps({"pong": data["ping"]}).decode())
                     continue
                 
                 # Dispatch to callbacks
@@ -259,18 +261,18 @@ class UserWSClient:
                     message = await asyncio.wait_for(self._ws.recv(), timeout=1.0)
                 except asyncio.TimeoutError:
                     continue  # Check _running and retry
-                data = json.loads(message)
+                data = orjson.loads(message)
                 
                 # Handle server ping (JSON-based)
                 if data.get("ping"):
-                    await self._ws.send(json.dumps({"pong": data["ping"]}))
+                    await self._ws.send(orjson.dumps({"pong": data["ping"]}).decode())
                     continue
                 
                 # Dispatch to callbacks based on channel
                 channel = data.get("channel")
                 
                 # Debug log for received messages
-                logger.debug(f"User stream message: channel={channel}")
+                logger.debug("User stream message: channel=%s", channel)
                 
                 if channel in self._callbacks:
                     for callback in self._callbacks[channel]:
@@ -320,7 +322,7 @@ class TradingWSClient:
         self._http_client = http_client  # HTTP fallback
         self._ws: Optional[WebSocketClientProtocol] = None
         self._running = False
-        self._session_id = str(__import__('uuid').uuid4())
+        self._session_id = str(uuid.uuid4())
         
         # Request tracking: request_id -> Future
         self._pending_requests: dict = {}
@@ -344,22 +346,22 @@ class TradingWSClient:
     
     async def _authenticate(self):
         """Authenticate with auth:login method."""
-        request_id = str(__import__('uuid').uuid4())
+        request_id = str(uuid.uuid4())
         
         msg = {
             "session_id": self._session_id,
             "request_id": request_id,
             "method": "auth:login",
-            "params": __import__('json').dumps({"token": self._auth.token})
+            "params": json.dumps({"token": self._auth.token})
         }
         
-        await self._ws.send(__import__('json').dumps(msg))
+        await self._ws.send(json.dumps(msg))
         logger.info("Trading WS auth sent")
         
         # Wait for auth response
         try:
             response = await asyncio.wait_for(self._ws.recv(), timeout=5.0)
-            data = __import__('json').loads(response)
+            data = json.loads(response)
             if data.get("code") not in (0, 200):
                 raise RuntimeError(f"Trading WS auth failed: {data}")
             logger.info("Trading WS authenticated")
@@ -382,15 +384,16 @@ class TradingWSClient:
         
         Falls back to HTTP if WS fails.
         """
+        # Same fields and key order as the HTTP new_order payload
         params = {
             "symbol": symbol,
             "side": side,
+            "order_type": order_type,
             "qty": qty,
             "price": price,
-            "cl_ord_id": cl_ord_id,
-            "order_type": order_type,
             "time_in_force": time_in_force,
             "reduce_only": reduce_only,
+            "cl_ord_id": cl_ord_id,
         }
         
         try:
@@ -439,10 +442,10 @@ class TradingWSClient:
         if not ws_valid:
             raise RuntimeError("Trading WS not connected")
         
-        request_id = str(__import__('uuid').uuid4())
+        request_id = str(uuid.uuid4())
         
         # Sign the request
-        params_json = __import__('json').dumps(params)
+        params_json = orjson.dumps(params).decode()
         sig_headers = self._auth.sign_request(params_json)
         
         msg = {
@@ -463,7 +466,7 @@ class TradingWSClient:
         self._pending_requests[request_id] = future
         
         try:
-            await self._ws.send(__import__('json').dumps(msg))
+            await self._ws.send(orjson.dumps(msg).decode())
             logger.debug(f"Trading WS sent {method}: {request_id}")
             
             # Wait for response with timeout
@@ -510,7 +513,7 @@ class TradingWSClient:
                     raw = await asyncio.wait_for(self._ws.recv(), timeout=1.0)
                     self._msg_count += 1
                     
-                    data = __import__('json').loads(raw)
+                    data = orjson.loads(raw)
                     request_id = data.get("request_id")
                     
                     # Resolve pending request
@@ -520,7 +523,7 @@ class TradingWSClient:
                             future.set_result(data)
                     
                     # Log heartbeat periodically
-                    now = __import__('time').time()
+                    now = time.time()
                     if now - self._last_heartbeat > 30:
                         logger.info(f"[Heartbeat] Trading WS alive, {self._msg_count} msgs")
                         self._last_heartbeat = now
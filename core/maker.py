@@ -4,10 +4,15 @@ Event-driven design:
 - Price updates trigger order checks
 - Order placement runs when conditions are met
 """
+import os
+import math
 import uuid
 import time
+import random
+import itertools
 import logging
 import asyncio
+from datetime import datetime
 from decimal import Decimal, ROUND_DOWN
 from typing import Optional
 
@@ -29,7 +34,6 @@ def send_notify(title: str, message: str, priority: str = "normal"):
         NOTIFY_URL: Notification service URL
         NOTIFY_API_KEY: API key for the notification service
     """
-    import os
     notify_url = os.environ.get("NOTIFY_URL", "")
     notify_api_key = os.environ.get("NOTIFY_API_KEY", "")
     
@@ -62,6 +66,10 @@ def send_notify(title: str, message: str, priority: str = "normal"):
 class Maker:
     """Market making logic."""
     
+    IDLE_CHECK_SEC = 5.0    # periodic wake when both quotes are resting
+    ACTIVE_CHECK_SEC = 1.0  # periodic wake while quotes are missing or cancels in flight
+    CHECK_JITTER = 0.1      # +/- fraction applied to the periodic wake
+    
     def __init__(self, config: Config, client: StandXHTTPClient, state: State, trading_ws_client=None):
         self.config = config
         self.client = client  # HTTP client (backup)
@@ -84,9 +92,14 @@ class Maker:
         
         # Pending close flag to prevent duplicate close attempts
         self._pending_close = False
+        # Rate limits for the stop-loss / profit-take checks
+        self._last_stop_loss_check_time = 0.0
+        self._last_profit_take_check_time = 0.0
         
         # Imbalance Guard cancel cooldown (prevent immediate re-order after cancel)
         self._imbalance_cancel_cooldown = {}  # {side: until_timestamp}
+        # CEX Guard cancel cooldown (same idea, triggered by CEX cross)
+        self._cex_cancel_cooldown = {}  # {side: until_timestamp}
         
         # Pending cancel tracking - prevent new orders on sides with pending cancels
         self._pending_cancels = {}  # {cl_ord_id: (side, timestamp)}
@@ -97,6 +110,25 @@ class Maker:
         self.monitor = EfficiencyMonitor()
         self._last_tick_time = 0.0
         self._price_window_sec = self._calc_price_window_sec()
+        # Windows read on every tick get O(1) running max/min in State
+        self.state.track_cex_extremes(config.amplitude_window_sec)
+        self.state.track_cex_extremes(config.volatility_window_sec)
+        
+        # Client order ids: random per-process prefix + counter (unique for this run, no urandom per order)
+        self._id_prefix = uuid.uuid4().hex[:6]
+        self._id_counter = itertools.count()
+        
+        # Config-derived constants for the order path (config is fixed after load)
+        # Different tick sizes for different symbols
+        if config.symbol.startswith("BTC"):
+            self._tick_size = 0.01
+            self._price_decimals = 2
+        else:
+            self._tick_size = 0.1
+            self._price_decimals = 1
+        self._default_qty_str = self._format_qty(config.order_size_btc)
+        # Exit margin: taker fee (for safety comparison) plus minimum profit
+        self._exit_margin = config.taker_fee_rate + (config.min_profit_bps / 10000)
 
     def _calc_price_window_sec(self) -> float:
         candidates = [
@@ -186,7 +218,7 @@ class Maker:
             try:
                 # Wait for price update signal (with timeout for periodic checks)
                 try:
-                    await asyncio.wait_for(self._pending_check.wait(), timeout=5.0)
+                    await asyncio.wait_for(self._pending_check.wait(), timeout=self._next_check_timeout())
                     self._pending_check.clear()
                 except asyncio.TimeoutError:
                     # Periodic check even without price updates
@@ -200,6 +232,15 @@ class Maker:
         
         logger.info("Maker stopped")
     
+    def _next_check_timeout(self) -> float:
+        """Periodic wake interval: re-check sooner while quotes are missing, back off when resting."""
+        if self._pending_cancels or not (self.state.has_order("buy") and self.state.has_order("sell")):
+            base = self.ACTIVE_CHECK_SEC
+        else:
+            base = self.IDLE_CHECK_SEC
+        # Jitter so periodic checks don't align with exchange-side batching
+        return base * random.uniform(1 - self.CHECK_JITTER, 1 + self.CHECK_JITTER)
+    
     async def stop(self):
         """Stop the maker loop."""
         self._running = False
@@ -286,9 +327,10 @@ class Maker:
         if reduced:
             return
 
-        # Step -2: DEX Staleness Guard
+        # Step -2: DEX Staleness Guard (State stamps updates on the monotonic clock)
+        mono_now = time.monotonic()
         if self.config.dex_staleness_sec > 0 and self.state.last_dex_update_time > 0:
-            time_since_dex = now - self.state.last_dex_update_time
+            time_since_dex = mono_now - self.state.last_dex_update_time
             if time_since_dex > self.config.dex_staleness_sec:
                 await self._activate_risk_guard(
                     f"DEX Data Stale: {time_since_dex:.1f}s > {self.config.dex_staleness_sec}s"
@@ -298,7 +340,7 @@ class Maker:
         # Step -2: CEX Staleness Guard (If configured)
         # Only check after first CEX data arrives (last_cex_update_time > 0)
         if self.config.binance_symbol and self.state.last_cex_update_time > 0:
-            time_since_cex = now - self.state.last_cex_update_time
+            time_since_cex = mono_now - self.state.last_cex_update_time
             if time_since_cex > self.config.binance_staleness_sec:
                 await self._activate_risk_guard(
                     f"Binance Data Stale: {time_since_cex:.1f}s > {self.config.binance_staleness_sec}s"
@@ -314,7 +356,7 @@ class Maker:
             dex_price = self.state.last_dex_price
             cex_price = self.state.last_cex_price
             if dex_price > 0:
-                spread_bps = abs(cex_price - dex_price) / dex_price * 10000
+                spread_bps = abs(cex_price - dex_price) * self.state.dex_bps_factor
 
         amp_bps = 0.0
         if self.config.binance_symbol:
@@ -541,7 +583,7 @@ class Maker:
         time_since_fill = time.time() - self.state.last_fill_time
         cooldown_active = time_since_fill < self.config.fill_cooldown_sec
         if cooldown_active:
-           logger.debug(f"Cool-down active: {time_since_fill:.1f}s < {self.config.fill_cooldown_sec}s")
+           logger.debug("Cool-down active: %.1fs < %ss", time_since_fill, self.config.fill_cooldown_sec)
         
         # If in cooldown and no position, skip new orders
         if cooldown_active and self.state.position == 0:
@@ -580,9 +622,9 @@ class Maker:
         
         if abs(skew_bps) > 1:
             logger.debug(
-                f"Skew: {skew_bps:.1f}bps | "
-                f"Buy T:{buy_target:.1f} [{buy_bounds[0]:.1f}, {buy_bounds[1]:.1f}] | "
-                f"Sell T:{sell_target:.1f} [{sell_bounds[0]:.1f}, {sell_bounds[1]:.1f}]"
+                "Skew: %.1fbps | Buy T:%.1f [%.1f, %.1f] | Sell T:%.1f [%.1f, %.1f]",
+                skew_bps, buy_target, buy_bounds[0], buy_bounds[1],
+                sell_target, sell_bounds[0], sell_bounds[1],
             )
         
         # Step 3: Check and cancel orders
@@ -603,42 +645,19 @@ class Maker:
             orders_to_cancel = list(orders_by_id.values())
         
         if orders_to_cancel:
-            for order in orders_to_cancel:
-                logger.info(f"Cancelling order: {order.cl_ord_id}")
-                try:
-                    # Track as pending cancel BEFORE sending request
-                    self._pending_cancels[order.cl_ord_id] = (order.side, time.time())
-                    
-                    response = await self.trading_client.cancel_order(order.cl_ord_id)
-                    
-                    # Validate response - only clear state if cancel was accepted
-                    if response.get("code") == 0:
-                        self.state.set_order(order.side, None)
-                        self.monitor.record_cancel()
-                        logger.info(f"Cancel confirmed: {order.cl_ord_id}")
-                    else:
-                        # Cancel rejected by exchange - DON'T clear local state
-                        error_msg = response.get("message", str(response))
-                        logger.error(f"Cancel rejected by exchange: {order.cl_ord_id}: {error_msg}")
-                        # Remove from pending since we got a response
-                        self._pending_cancels.pop(order.cl_ord_id, None)
-                        
-                except Exception as e:
-                    logger.error(f"Failed to cancel order {order.cl_ord_id}: {e}")
-                    # Remove from pending on error
-                    self._pending_cancels.pop(order.cl_ord_id, None)
-                    send_notify(
-                        "StandX 撤单失败",
-                        f"{self.config.symbol} 撤单失败: {e}",
-                        priority="high"
-                    )
+            # Cancels are independent per side; send them concurrently
+            results = await asyncio.gather(
+                *(self._cancel_order(order) for order in orders_to_cancel),
+                return_exceptions=True,
+            )
+            for order, result in zip(orders_to_cancel, results):
+                if isinstance(result, Exception):
+                    logger.error("Cancel %s order failed: %s", order.side, result, exc_info=result)
             
             # If CEX triggered, set cooldown to prevent immediate re-placing at same price
             if cex_triggered_sides:
                 cooldown_sec = 5.0  # Wait 5s for CEX price to stabilize
                 for side in cex_triggered_sides:
-                    if not hasattr(self, '_cex_cancel_cooldown'):
-                        self._cex_cancel_cooldown = {}
                     self._cex_cancel_cooldown[side] = time.time() + cooldown_sec
                     logger.warning(f"CEX cancel cooldown: {side} blocked for {cooldown_sec}s")
             
@@ -650,27 +669,25 @@ class Maker:
         pass
         
         # Step 5: Place missing orders (respect CEX cooldown)
-        if hasattr(self, '_cex_cancel_cooldown'):
-            now = time.time()
-            cooldown_active = {side for side, until in self._cex_cancel_cooldown.items() if now < until}
-            if cooldown_active:
-                allowed_sides = allowed_sides - cooldown_active
-                logger.debug(f"CEX cooldown active for: {cooldown_active}")
+        now = time.time()
+        cooldown_active = {side for side, until in self._cex_cancel_cooldown.items() if now < until}
+        if cooldown_active:
+            allowed_sides = allowed_sides - cooldown_active
+            logger.debug("CEX cooldown active for: %s", cooldown_active)
         
         # Also respect Imbalance Guard cooldown
-        now = time.time()
         imb_cooldown_active = {side for side, until in self._imbalance_cancel_cooldown.items() if now < until}
         if imb_cooldown_active:
             allowed_sides = allowed_sides - imb_cooldown_active
-            logger.debug(f"Imbalance cooldown active for: {imb_cooldown_active}")
+            logger.debug("Imbalance cooldown active for: %s", imb_cooldown_active)
         
         # Block sides that have pending cancels (waiting for WS confirmation)
         pending_cancel_sides = {side for side, _ in self._pending_cancels.values()}
         if pending_cancel_sides:
             allowed_sides = allowed_sides - pending_cancel_sides
-            logger.debug(f"Pending cancels blocking sides: {pending_cancel_sides}")
+            logger.debug("Pending cancels blocking sides: %s", pending_cancel_sides)
         
-        logger.debug(f"Tick targets: Buy {buy_target:.1f}bps, Sell {sell_target:.1f}bps, Allowed: {allowed_sides}")
+        logger.debug("Tick targets: Buy %.1fbps, Sell %.1fbps, Allowed: %s", buy_target, sell_target, allowed_sides)
 
         exit_qty = abs(self.state.position) if self.state.position != 0 else None
         await self._place_missing_orders(buy_target, sell_target, allowed_sides, exit_qty=exit_qty)
@@ -722,7 +739,7 @@ class Maker:
             # Taker Fee Rate: self.config.taker_fee_rate (e.g. 0.0004)
             # Min Profit: self.config.min_profit_bps (e.g. 2 bps)
             
-            required_margin = self.config.taker_fee_rate + (self.config.min_profit_bps / 10000)
+            required_margin = self._exit_margin
             
             if position_qty > 0: # Long Position -> Sell Order is the Exit
                 # We want to sell higher than entry
@@ -745,13 +762,18 @@ class Maker:
                     logger.info(f"Maker Exit: Adjusting Buy Target {buy_target_price:.2f} -> {exit_price:.2f} (Entry: {entry_price})")
                     buy_target_price = min(buy_target_price, exit_price)
 
+        # Place missing sides concurrently (slots are pre-reserved in _place_order)
+        tasks = []
+        task_sides = []
+        
         # Place buy order if missing
         if "buy" in allowed_sides and not self.state.has_order("buy"):
             qty = exit_qty if exit_side == "buy" else None
             if qty is None or qty > 0:
-                await self._place_order("buy", buy_target_price, qty=qty, reduce_only=reduce_only and exit_side == "buy")
+                tasks.append(self._place_order("buy", buy_target_price, qty=qty, reduce_only=reduce_only and exit_side == "buy"))
+                task_sides.append("buy")
             else:
-                logger.debug(f"Skipping BUY: qty={qty}")
+                logger.debug("Skipping BUY: qty=%s", qty)
         elif "buy" not in allowed_sides:
             logger.debug("Skipping BUY: not allowed")
         
@@ -759,12 +781,58 @@ class Maker:
         if "sell" in allowed_sides and not self.state.has_order("sell"):
             qty = exit_qty if exit_side == "sell" else None
             if qty is None or qty > 0:
-                await self._place_order("sell", sell_target_price, qty=qty, reduce_only=reduce_only and exit_side == "sell")
+                tasks.append(self._place_order("sell", sell_target_price, qty=qty, reduce_only=reduce_only and exit_side == "sell"))
+                task_sides.append("sell")
             else:
-                logger.debug(f"Skipping SELL: qty={qty}")
+                logger.debug("Skipping SELL: qty=%s", qty)
         elif "sell" not in allowed_sides:
             logger.debug("Skipping SELL: not allowed")
+        
+        if tasks:
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            for side, result in zip(task_sides, results):
+                if isinstance(result, Exception):
+                    logger.error("Place %s order failed: %s", side, result, exc_info=result)
     
+    async def _cancel_order(self, order: OpenOrder, reason: Optional[str] = None) -> bool:
+        """Cancel a single tracked order, clearing local state only when accepted.
+        
+        Returns:
+            True if the exchange accepted the cancel, False otherwise
+        """
+        prefix = f"{reason}: " if reason else ""
+        logger.info(f"{prefix}Cancelling order: {order.cl_ord_id}")
+        try:
+            # Track as pending cancel BEFORE sending request (blocks new orders until WS confirms)
+            self._pending_cancels[order.cl_ord_id] = (order.side, time.time())
+            
+            response = await self.trading_client.cancel_order(order.cl_ord_id)
+            
+            # Validate response - only clear state if cancel was accepted
+            if response.get("code") == 0:
+                self.state.set_order(order.side, None)
+                self.monitor.record_cancel()
+                logger.info(f"{prefix}Cancel confirmed: {order.cl_ord_id}")
+                return True
+            
+            # Cancel rejected by exchange - DON'T clear local state
+            error_msg = response.get("message", str(response))
+            logger.error(f"{prefix}Cancel rejected by exchange: {order.cl_ord_id}: {error_msg}")
+            # Remove from pending since we got a response
+            self._pending_cancels.pop(order.cl_ord_id, None)
+                
+        except Exception as e:
+            logger.error(f"{prefix}Failed to cancel order {order.cl_ord_id}: {e}")
+            # Remove from pending on error
+            self._pending_cancels.pop(order.cl_ord_id, None)
+            if reason is None:
+                send_notify(
+                    "StandX 撤单失败",
+                    f"{self.config.symbol} 撤单失败: {e}",
+                    priority="high"
+                )
+        return False
+
     async def _cancel_all_orders(self, reason: str = "Risk Guard"):
         """Helper to cancel all orders."""
         try:
@@ -776,26 +844,11 @@ class Maker:
             
             if orders_to_cancel:
                 logger.warning(f"{reason}: Cancelling {len(orders_to_cancel)} orders...")
-                all_ok = True
-                for order in orders_to_cancel:
-                    if not order:
-                        continue
-                    try:
-                        # Track as pending cancel to block new orders until WS confirms
-                        self._pending_cancels[order.cl_ord_id] = (order.side, time.time())
-                        response = await self.trading_client.cancel_order(order.cl_ord_id)
-                        if response.get("code") == 0:
-                            self.state.set_order(order.side, None)
-                            self.monitor.record_cancel()
-                        else:
-                            all_ok = False
-                            error_msg = response.get("message", str(response))
-                            logger.error(f"{reason}: Cancel rejected {order.cl_ord_id}: {error_msg}")
-                            self._pending_cancels.pop(order.cl_ord_id, None)
-                    except Exception as e:
-                        all_ok = False
-                        logger.error(f"{reason}: Failed to cancel {order.cl_ord_id}: {e}")
-                        self._pending_cancels.pop(order.cl_ord_id, None)
+                results = await asyncio.gather(
+                    *(self._cancel_order(order, reason) for order in orders_to_cancel if order),
+                    return_exceptions=True,
+                )
+                all_ok = all(result is True for result in results)
                 return all_ok
             return True
         except Exception as e:
@@ -819,7 +872,7 @@ class Maker:
             logger.warning(f"Pending cancels expired and cleared: {len(expired)}")
 
     def _cleanup_cooldowns(self, now: float):
-        if hasattr(self, "_cex_cancel_cooldown") and self._cex_cancel_cooldown:
+        if self._cex_cancel_cooldown:
             expired = [side for side, until in self._cex_cancel_cooldown.items() if now >= until]
             for side in expired:
                 self._cex_cancel_cooldown.pop(side, None)
@@ -917,31 +970,27 @@ class Maker:
 
     async def _place_order(self, side: str, price: float, qty: Optional[float] = None, reduce_only: bool = False):
         """Place a single order."""
-        import math
-        
         # Double-check we don't already have an order (concurrent prevention)
         if self.state.has_order(side):
-            logger.debug(f"Skipping {side} order: already have one")
+            logger.debug("Skipping %s order: already have one", side)
             return
         
-        cl_ord_id = f"mm-{side}-{uuid.uuid4().hex[:8]}"
+        cl_ord_id = f"mm-{side}-{self._id_prefix}{next(self._id_counter):x}"
         
-        # Different tick sizes for different symbols
-        if self.config.symbol.startswith("BTC"):
-            tick_size = 0.01
-            price_decimals = 2
-        else:
-            tick_size = 0.1
-            price_decimals = 1
+        tick_size = self._tick_size
         
         # Align price to tick (floor for buy, ceil for sell)
         if side == "buy":
             aligned_price = math.floor(price / tick_size) * tick_size
         else:
             aligned_price = math.ceil(price / tick_size) * tick_size
-        price_str = f"{aligned_price:.{price_decimals}f}"
-        order_qty = self.config.order_size_btc if qty is None else qty
-        qty_str = self._format_qty(order_qty)
+        price_str = f"{aligned_price:.{self._price_decimals}f}"
+        if qty is None:
+            order_qty = self.config.order_size_btc
+            qty_str = self._default_qty_str
+        else:
+            order_qty = qty
+            qty_str = self._format_qty(order_qty)
         if qty_str == "0":
             logger.warning(f"Skipping {side} order: qty too small ({order_qty})")
             return
@@ -955,18 +1004,19 @@ class Maker:
             reduce_only=reduce_only,
         ))
         
-        logger.info(f"Placing {side} order: {qty_str} @ {price_str} (cl_ord_id: {cl_ord_id})")
+        logger.info("Placing %s order: %s @ %s (cl_ord_id: %s)", side, qty_str, price_str, cl_ord_id)
         
         # Log risk parameters at order placement for comparison with fill time
-        cex_price = self.state.last_cex_price or 0
-        dex_price = self.state.last_dex_price or 0
-        spread_bps = self.state.get_spread_bps() if hasattr(self.state, 'get_spread_bps') else 0
-        vol_bps = self.state.get_volatility_bps() if hasattr(self.state, 'get_volatility_bps') else 0
-        imbalance = getattr(self.state, 'last_imbalance', 0)
-        logger.debug(
-            f"ORDER_CONTEXT: {cl_ord_id} | CEX={cex_price:.2f} DEX={dex_price:.2f} | "
-            f"Spread={spread_bps:.1f}bps Vol={vol_bps:.1f}bps Imb={imbalance:.2f}"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            cex_price = self.state.last_cex_price or 0
+            dex_price = self.state.last_dex_price or 0
+            spread_bps = self.state.get_spread_bps()
+            vol_bps = self.state.get_volatility_bps()
+            imbalance = self.state.last_imbalance
+            logger.debug(
+                f"ORDER_CONTEXT: {cl_ord_id} | CEX={cex_price:.2f} DEX={dex_price:.2f} | "
+                f"Spread={spread_bps:.1f}bps Vol={vol_bps:.1f}bps Imb={imbalance:.2f}"
+            )
         
         try:
             response = await self.trading_client.new_order(
@@ -981,7 +1031,7 @@ class Maker:
             if response.get("code") == 0:
                 # Order placed successfully, slot already reserved
                 self.monitor.record_order()
-                logger.info(f"Order placed successfully: {cl_ord_id}")
+                logger.info("Order placed successfully: %s", cl_ord_id)
             else:
                 # Order failed, clear the pre-reserved slot
                 self.state.set_order(side, None)
@@ -1012,7 +1062,6 @@ class Maker:
         if not self._reduce_log_file:
             return
         try:
-            from datetime import datetime
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             with open(self._reduce_log_file, "a") as f:
                 f.write(f"{timestamp},{action},{qty_change:+.4f},{reason}\n")
@@ -1043,9 +1092,8 @@ class Maker:
 
         # Rate limit: max once every 5 seconds
         now = time.time()
-        if hasattr(self, "_last_profit_take_check_time"):
-            if now - self._last_profit_take_check_time < 5.0:
-                return False
+        if now - self._last_profit_take_check_time < 5.0:
+            return False
         self._last_profit_take_check_time = now
 
         try:
@@ -1158,9 +1206,8 @@ class Maker:
         
         # Rate limit: max once every 2 seconds to avoid 429
         now = time.time()
-        if hasattr(self, '_last_stop_loss_check_time'):
-            if now - self._last_stop_loss_check_time < 2.0:
-                return False
+        if now - self._last_stop_loss_check_time < 2.0:
+            return False
         self._last_stop_loss_check_time = now
         
         try:
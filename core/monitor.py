@@ -1,35 +1,48 @@
 """Efficiency Monitor for tracking market making performance."""
 import time
-from typing import Optional, Dict
+from typing import Optional
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class EfficiencyStats:
+    """Accumulators for one report interval."""
+    tier1_notional_time: float = 0.0  # 0-10bps (100%)
+    tier2_notional_time: float = 0.0  # 10-30bps (50%)
+    out_of_band_notional_time: float = 0.0  # >30bps (0%)
+    warmup_notional_time: float = 0.0  # < min_rest_sec
+    total_order_notional_time: float = 0.0
+    total_time: float = 0.0
+    orders: int = 0
+    cancels: int = 0
+    fills: int = 0
+    realized_pnl: float = 0.0
+    fees_paid: float = 0.0
+
+
+@dataclass(slots=True)
+class SyncedStats:
+    """Stats synced from HTTP API (Report Only)."""
+    fills: Optional[int] = None
+    realized_pnl: Optional[float] = None
+    equity: Optional[float] = None
+    balance: Optional[float] = None
+
 
 class EfficiencyMonitor:
     """Tracks time spent in different spread efficiency buckets."""
     
     def __init__(self):
-        self._stats = {
-            "tier1_notional_time": 0.0,  # 0-10bps (100%)
-            "tier2_notional_time": 0.0,  # 10-30bps (50%)
-            "out_of_band_notional_time": 0.0,  # >30bps (0%)
-            "warmup_notional_time": 0.0,  # < min_rest_sec
-            "total_order_notional_time": 0.0,
-            "total_time": 0.0,
-            "orders": 0,
-            "cancels": 0,
-            "fills": 0,
-            "realized_pnl": 0.0,
-            "fees_paid": 0.0,
-        }
+        self._stats = EfficiencyStats()
         # Synced stats from HTTP API (Report Only)
-        self._synced_stats = {
-            "fills": None,
-            "realized_pnl": None,
-            "equity": None,
-            "balance": None
-        }
+        self._synced_stats = SyncedStats()
         self._order_id = {"buy": None, "sell": None}
         self._order_start = {"buy": None, "sell": None}
         self._min_rest_sec = 3.0
-        self._last_report_time = time.time()
+        # Interval timing uses the monotonic clock (immune to NTP steps);
+        # the wall-clock start is kept only to match exchange timestamps.
+        self._last_report_time = time.monotonic()
+        self.report_window_start = time.time()
     
     def update(
         self,
@@ -53,8 +66,16 @@ class EfficiencyMonitor:
             return
 
         self._min_rest_sec = min_rest_sec
-        self._stats["total_time"] += dt
-        now = time.time()
+        self._stats.total_time += dt
+
+        # Fast path: nothing resting (e.g. cancel-then-replace gap)
+        if buy_order is None and sell_order is None:
+            self._order_id["buy"] = self._order_id["sell"] = None
+            self._order_start["buy"] = self._order_start["sell"] = None
+            return
+
+        now = time.monotonic()
+        bps_factor = 10000.0 / mark_price  # one division per tick, shared by both sides
 
         self._sync_order_state("buy", buy_order, now)
         self._sync_order_state("sell", sell_order, now)
@@ -67,21 +88,22 @@ class EfficiencyMonitor:
             if start_time is None:
                 continue
 
-            notional = abs(order.qty) * mark_price
-            self._stats["total_order_notional_time"] += notional * dt
+            # Notional-time weight for this side, computed once per tick
+            notional_dt = abs(order.qty) * mark_price * dt
+            self._stats.total_order_notional_time += notional_dt
 
             if now - start_time < min_rest_sec:
-                self._stats["warmup_notional_time"] += notional * dt
+                self._stats.warmup_notional_time += notional_dt
                 continue
 
-            distance_bps = abs(order.price - mark_price) / mark_price * 10000
+            distance_bps = abs(order.price - mark_price) * bps_factor
 
             if distance_bps <= 10:
-                self._stats["tier1_notional_time"] += notional * dt
+                self._stats.tier1_notional_time += notional_dt
             elif distance_bps <= 30:
-                self._stats["tier2_notional_time"] += notional * dt
+                self._stats.tier2_notional_time += notional_dt
             else:
-                self._stats["out_of_band_notional_time"] += notional * dt
+                self._stats.out_of_band_notional_time += notional_dt
 
     def _sync_order_state(self, side: str, order: Optional[object], now: float):
         if not order:
@@ -95,40 +117,40 @@ class EfficiencyMonitor:
 
     def record_order(self):
         """Record an order placement."""
-        self._stats["orders"] += 1
+        self._stats.orders += 1
         
     def record_cancel(self):
         """Record an order cancellation."""
-        self._stats["cancels"] += 1
+        self._stats.cancels += 1
         
     def record_fill(self, pnl: float = 0.0, fee: float = 0.0):
         """Record a fill event with optional PnL and fee."""
-        self._stats["fills"] += 1
-        self._stats["realized_pnl"] += pnl
-        self._stats["fees_paid"] += fee
+        self._stats.fills += 1
+        self._stats.realized_pnl += pnl
+        self._stats.fees_paid += fee
 
     def update_synced_stats(self, fills: int, pnl: float, equity: float, balance: float):
         """Update synced stats from reliable HTTP source."""
-        self._synced_stats["fills"] = fills
-        self._synced_stats["realized_pnl"] = pnl
-        self._synced_stats["equity"] = equity
-        self._synced_stats["balance"] = balance
+        self._synced_stats.fills = fills
+        self._synced_stats.realized_pnl = pnl
+        self._synced_stats.equity = equity
+        self._synced_stats.balance = balance
 
     def should_report(self, interval: int = 300) -> bool:
         """Check if it's time to report stats."""
-        return time.time() - self._last_report_time >= interval
+        return time.monotonic() - self._last_report_time >= interval
 
     def get_report(self) -> str:
         """Generate and reset statistics report."""
-        total = self._stats["total_time"]
-        total_notional_time = self._stats["total_order_notional_time"]
+        total = self._stats.total_time
+        total_notional_time = self._stats.total_order_notional_time
         if total == 0 or total_notional_time == 0:
             return "Efficiency: No Data"
 
-        tier1 = self._stats["tier1_notional_time"]
-        tier2 = self._stats["tier2_notional_time"]
-        out_of_band = self._stats["out_of_band_notional_time"]
-        warmup = self._stats["warmup_notional_time"]
+        tier1 = self._stats.tier1_notional_time
+        tier2 = self._stats.tier2_notional_time
+        out_of_band = self._stats.out_of_band_notional_time
+        warmup = self._stats.warmup_notional_time
 
         t1 = tier1 / total_notional_time * 100
         t2 = tier2 / total_notional_time * 100
@@ -140,42 +162,44 @@ class EfficiencyMonitor:
         eligible_ratio = (tier1 + tier2) / total_notional_time
         
         # Prefer synced stats for PnL/Fills if available
-        fills = self._synced_stats["fills"] if self._synced_stats["fills"] is not None else self._stats["fills"]
-        pnl = self._synced_stats["realized_pnl"] if self._synced_stats["realized_pnl"] is not None else self._stats["realized_pnl"]
-        equity = self._synced_stats["equity"]
-        balance = self._synced_stats["balance"]
+        fills = self._synced_stats.fills if self._synced_stats.fills is not None else self._stats.fills
+        pnl = self._synced_stats.realized_pnl if self._synced_stats.realized_pnl is not None else self._stats.realized_pnl
+        equity = self._synced_stats.equity
+        balance = self._synced_stats.balance
         
-        report = (
-            f"Efficiency Report (Last {total:.1f}s):\n"
-        )
+        lines = [f"Efficiency Report (Last {total:.1f}s):"]
         
         if equity is not None:
-            report += (
-                f"  Account:\n"
-                f"    Equity:  ${equity:.2f}\n"
-                f"    Balance: ${balance:.2f}\n" 
-            )
+            lines.extend((
+                "  Account:",
+                f"    Equity:  ${equity:.2f}",
+                f"    Balance: ${balance:.2f}",
+            ))
             
-        report += (
-            f"  Points Bands (Notional-weighted):\n"
-            f"    0-10bps (100%): {t1:6.2f}%\n"
-            f"    10-30bps (50%): {t2:6.2f}%\n"
-            f"    >30bps (0%):    {t0:6.2f}%\n"
-            f"    Warmup (<{self._min_rest_sec:.0f}s):   {tw:6.2f}%\n"
-            f"  Points Efficiency:\n"
-            f"    Eligible Ratio:      {eligible_ratio * 100:6.2f}%\n"
-            f"    Weighted Efficiency: {points_efficiency * 100:6.2f}%\n"
-            f"  Operations:\n"
-            f"    Orders:  {self._stats['orders']}\n"
-            f"    Cancels: {self._stats['cancels']}\n"
-            f"    Fills:   {fills}\n"
-            f"    PnL:     Realized ${pnl:.4f}\n"
-            f"    Fees:    ${self._stats['fees_paid']:.4f}\n" 
-        )
+        lines.extend((
+            "  Points Bands (Notional-weighted):",
+            f"    0-10bps (100%): {t1:6.2f}%",
+            f"    10-30bps (50%): {t2:6.2f}%",
+            f"    >30bps (0%):    {t0:6.2f}%",
+            f"    Warmup (<{self._min_rest_sec:.0f}s):   {tw:6.2f}%",
+            "  Points Efficiency:",
+            f"    Eligible Ratio:      {eligible_ratio * 100:6.2f}%",
+            f"    Weighted Efficiency: {points_efficiency * 100:6.2f}%",
+            "  Operations:",
+            f"    Orders:  {self._stats.orders}",
+            f"    Cancels: {self._stats.cancels}",
+            f"    Fills:   {fills}",
+            f"    PnL:     Realized ${pnl:.4f}",
+            f"    Fees:    ${self._stats.fees_paid:.4f}",
+        ))
+        # Keep the trailing newline of the original multi-line format
+        report = "\n".join(lines) + "\n"
         
-        # Reset stats
-        self._stats = {k: 0.0 if isinstance(v, float) else 0 for k, v in self._stats.items()}
-        self._stats["total_time"] = 0.0
-        self._last_report_time = time.time()
+        # Reset stats; synced stats are per window too, so a window with no
+        # sync falls back to the local counters instead of repeating the last one
+        self._stats = EfficiencyStats()
+        self._synced_stats = SyncedStats()
+        self._last_report_time = time.monotonic()
+        self.report_window_start = time.time()
         
         return report
@@ -3,11 +3,113 @@ Shared reporting logic for efficiency statistics.
 """
 import os
 import re
+import mmap
 import logging
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Logs are scanned as bytes straight from an mmap, so every pattern is a
+# bytes pattern and nothing is decoded.
+# Header line: timestamp and block duration in one scan
+# Relaxed regex to match various formats containing timestamp and keyword
+_HEADER_RE = re.compile(
+    rb"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}).*Efficiency Report"
+    rb"(?:.*\(Last (\d+\.?\d*)s\):)?",
+    re.MULTILINE,
+)
+
+# Block lines: one alternation of literal-led patterns. The alternatives are
+# left unnamed so the engine can skip ahead on their leading characters; the
+# index of the last captured group identifies the stat instead.
+# Percentages are legacy tiers, points bands (new format) and warmup;
+# Orders/Cancels/Fills are counts (multi-line format compatible):
+#   Operations:
+#     Orders:  X
+#     Cancels: Y
+#     Fills:   Z
+_STAT_PATTERNS = (
+    ("tier1_time", rb"Tier 1.*:\s+(\d+\.\d+)%"),
+    ("tier2_time", rb"Tier 2.*:\s+(\d+\.\d+)%"),
+    ("tier3_time", rb"Tier 3.*:\s+(\d+\.\d+)%"),
+    ("tier4_time", rb"Tier 4.*:\s+(\d+\.\d+)%"),
+    ("band_0_10_time", rb"0-10bps.*:\s+(\d+\.\d+)%"),
+    ("band_10_30_time", rb"10-30bps.*:\s+(\d+\.\d+)%"),
+    ("band_out_time", rb">30bps.*:\s+(\d+\.\d+)%"),
+    ("warmup_time", rb"Warmup\s+\(<(\d+\.?\d*)s\):\s+(\d+\.\d+)%"),
+    ("eligible_ratio_time", rb"Eligible Ratio:\s+(\d+\.\d+)%"),
+    ("weighted_efficiency_time", rb"Weighted Efficiency:\s+(\d+\.\d+)%"),
+    ("orders", rb"Orders:\s+(\d+)"),
+    ("cancels", rb"Cancels:\s+(\d+)"),
+    ("fills", rb"Fills:\s+(\d+)"),
+)
+
+
+def _stat_keys_by_group(patterns) -> dict:
+    """Map the last group index of each joined pattern to its stat key."""
+    keys, index = {}, 0
+    for key, pattern in patterns:
+        index += re.compile(pattern).groups
+        keys[index] = key
+    return keys
+
+
+_STAT_RE = re.compile(b"|".join(pattern for _, pattern in _STAT_PATTERNS))
+_STAT_KEYS = _stat_keys_by_group(_STAT_PATTERNS)  # lastindex -> key; that group holds the value
+# Legacy tier labels also name a band ("Tier 1 (0-10bps)") and have
+# always been counted under both keys
+_TIER_BAND_RE = re.compile(rb"(?P<band_0_10_time>0-10bps)|(?P<band_10_30_time>10-30bps)|(?P<band_out_time>>30bps)")
+_COUNT_KEYS = ("orders", "cancels", "fills")
+# Fixed "  Orders:  N" lines are read with startswith/partition, no regex
+_COUNT_PREFIXES = (b"Orders:", b"Cancels:", b"Fills:")
+_COUNT_LABELS = {b"Orders": "orders", b"Cancels": "cancels", b"Fills": "fills"}
+
+# (log_path, hours) -> (file signature, oldest counted report time, stats)
+_parse_cache = {}
+
+
+def _rotated_logs(log_path: str) -> list:
+    """Return rotated siblings of log_path (log.1, log.2, ...), newest first.
+
+    One directory listing instead of an exists() probe per suffix.
+    """
+    directory, name = os.path.split(log_path)
+    prefix = name + "."
+    rotated = []
+    try:
+        with os.scandir(directory or ".") as entries:
+            for entry in entries:
+                suffix = entry.name[len(prefix):]
+                if entry.name.startswith(prefix) and suffix.isdigit():
+                    rotated.append((int(suffix), os.path.join(directory, entry.name)))
+    except OSError:
+        return []
+    return [path for _, path in sorted(rotated)]
+
+
+def _find_window_start(mm: mmap.mmap, cutoff: bytes):
+    """Scan a log backwards for the oldest report header newer than cutoff.
+
+    Returns (offset, reached_cutoff): offset is the end of the file when no
+    header is in the window, reached_cutoff tells whether an older header was
+    seen, i.e. everything before this file is outside the window too.
+    """
+    start = end = len(mm)
+    while True:
+        # Jump header to header instead of walking every line
+        pos = mm.rfind(b"Efficiency Report", 0, end)
+        if pos < 0:
+            return start, False
+        line_start = mm.rfind(b"\n", 0, pos) + 1
+        ts_match = _HEADER_RE.match(mm, line_start)
+        if ts_match:
+            if ts_match.group(1) > cutoff:
+                start = line_start
+            else:
+                return start, True
+        end = line_start
+
+
 def parse_efficiency_log(log_path: str, hours: int = 6) -> dict:
     """Parse efficiency log and aggregate stats for the last N hours."""
     if not os.path.exists(log_path):
@@ -15,7 +117,24 @@ def parse_efficiency_log(log_path: str, hours: int = 6) -> dict:
         return None
 
     now = datetime.now()
-    cutoff_time = now - timedelta(hours=hours)
+    # Header timestamps are fixed-width "%Y-%m-%d %H:%M:%S", so they order
+    # lexically and compare against the cutoff without being parsed
+    cutoff = (now - timedelta(hours=hours)).strftime("%Y-%m-%d %H:%M:%S").encode()
+
+    # Check main log and rotated logs, newest first
+    files_to_check = [log_path] + _rotated_logs(log_path)
+
+    # Reuse the last result while no file changed and the moved cutoff has
+    # not passed the oldest report it counted
+    try:
+        signature = tuple((st.st_mtime_ns, st.st_size) for st in map(os.stat, files_to_check))
+    except OSError:
+        signature = None
+    cached = _parse_cache.get((log_path, hours))
+    if cached and signature is not None and cached[0] == signature and (
+        cached[1] is None or cached[1] > cutoff
+    ):
+        return dict(cached[2])
     
     stats = {
         "band_0_10_time": 0.0,
@@ -36,139 +155,160 @@ def parse_efficiency_log(log_path: str, hours: int = 6) -> dict:
         "report_count": 0
     }
     
-    # Regex to extract timestamp
-    # Relaxed regex to match various formats containing timestamp and keyword
-    timestamp_pattern = re.compile(r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}).*Efficiency Report")
-    
-    # Regex to extract duration
-    duration_pattern = re.compile(r"\(Last (\d+\.?\d*)s\):")
-    
-    # Regex to extract percentages (legacy tiers)
-    tier1_pattern = re.compile(r"Tier 1.*:\s+(\d+\.\d+)%")
-    tier2_pattern = re.compile(r"Tier 2.*:\s+(\d+\.\d+)%")
-    tier3_pattern = re.compile(r"Tier 3.*:\s+(\d+\.\d+)%")
-    tier4_pattern = re.compile(r"Tier 4.*:\s+(\d+\.\d+)%")
-
-    # Regex to extract points bands (new format)
-    band_0_10_pattern = re.compile(r"0-10bps.*:\s+(\d+\.\d+)%")
-    band_10_30_pattern = re.compile(r"10-30bps.*:\s+(\d+\.\d+)%")
-    band_out_pattern = re.compile(r">30bps.*:\s+(\d+\.\d+)%")
-    warmup_pattern = re.compile(r"Warmup\s+\(<(\d+\.?\d*)s\):\s+(\d+\.\d+)%")
-    eligible_pattern = re.compile(r"Eligible Ratio:\s+(\d+\.\d+)%")
-    weighted_pattern = re.compile(r"Weighted Efficiency:\s+(\d+\.\d+)%")
-    
-    # Regex for stats
-    # Regex for stats (Multi-line format compatible)
-    # New format:
-    #   Operations:
-    #     Orders:  X
-    #     Cancels: Y
-    #     Fills:   Z
-    orders_pattern = re.compile(r"Orders:\s+(\d+)")
-    cancels_pattern = re.compile(r"Cancels:\s+(\d+)")
-    fills_pattern = re.compile(r"Fills:\s+(\d+)")
-    
     try:
         current_entry_time = None
         current_duration = 0.0
-        
-        # Check main log and rotated logs (up to .5)
-        files_to_check = [log_path]
-        for i in range(1, 6):
-            rotated = f"{log_path}.{i}"
-            if os.path.exists(rotated):
-                files_to_check.append(rotated)
+        scale = 0.0  # current_duration / 100, applied to each percentage line
+        oldest_entry_time = None
         
         for file_path in files_to_check:
             # logger.info(f"Parsing {file_path}...")
+            # Files are newest first and chronological inside, so only the
+            # tail after the oldest in-window header needs parsing
             try:
-                with open(file_path, 'r') as f:
-                    lines = f.readlines()
-            except Exception:
-                continue
-                
-            for line in lines:
-                # Check for header and timestamp
-                ts_match = timestamp_pattern.search(line)
-                if ts_match:
-                    ts_str = ts_match.group(1)
-                    entry_time = datetime.strptime(ts_str, "%Y-%m-%d %H:%M:%S")
-                    
-                    if entry_time > cutoff_time:
-                        current_entry_time = entry_time
+                with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    start, reached_cutoff = _find_window_start(mm, cutoff)
+                    mm.seek(start)
+                    for line in iter(mm.readline, b""):
+                        # Check for header and timestamp; substring tests are far
+                        # cheaper than the regex and reject most lines up front
+                        ts_match = _HEADER_RE.search(line) if b"Efficiency Report" in line else None
+                        if ts_match:
+                            ts_str, dur_str = ts_match.groups()
+                            if ts_str > cutoff:
+                                current_entry_time = ts_str
+                                if oldest_entry_time is None or ts_str < oldest_entry_time:
+                                    oldest_entry_time = ts_str
                         
-                        # Extract duration of this block
-                        dur_match = duration_pattern.search(line)
-                        if dur_match:
-                            current_duration = float(dur_match.group(1))
-                            stats["total_time"] += current_duration
-                            stats["report_count"] += 1
-                        else:
-                            current_duration = 0.0
-                    else:
-                        current_entry_time = None # Skip this block
+                                # Extract duration of this block
+                                if dur_str:
+                                    current_duration = float(dur_str)
+                                    stats["total_time"] += current_duration
+                                    stats["report_count"] += 1
+                                else:
+                                    current_duration = 0.0
+                                scale = current_duration * 0.01
+                            else:
+                                current_entry_time = None # Skip this block
                         
-                elif current_entry_time:
-                    # We are inside a valid block, parse stats
-                    t1 = tier1_pattern.search(line)
-                    if t1: stats["tier1_time"] += float(t1.group(1)) * current_duration / 100
-                    
-                    t2 = tier2_pattern.search(line)
-                    if t2: stats["tier2_time"] += float(t2.group(1)) * current_duration / 100
-                    
-                    t3 = tier3_pattern.search(line)
-                    if t3: stats["tier3_time"] += float(t3.group(1)) * current_duration / 100
-                    
-                    t4 = tier4_pattern.search(line)
-                    if t4: stats["tier4_time"] += float(t4.group(1)) * current_duration / 100
-
-                    b1 = band_0_10_pattern.search(line)
-                    if b1: stats["band_0_10_time"] += float(b1.group(1)) * current_duration / 100
-
-                    b2 = band_10_30_pattern.search(line)
-                    if b2: stats["band_10_30_time"] += float(b2.group(1)) * current_duration / 100
-
-                    bout = band_out_pattern.search(line)
-                    if bout: stats["band_out_time"] += float(bout.group(1)) * current_duration / 100
-
-                    warm = warmup_pattern.search(line)
-                    if warm:
-                        stats["warmup_threshold"] = float(warm.group(1))
-                        stats["warmup_time"] += float(warm.group(2)) * current_duration / 100
-
-                    eligible = eligible_pattern.search(line)
-                    if eligible:
-                        stats["eligible_ratio_time"] += float(eligible.group(1)) * current_duration / 100
-
-                    weighted = weighted_pattern.search(line)
-                    if weighted:
-                        stats["weighted_efficiency_time"] += float(weighted.group(1)) * current_duration / 100
-                    
-                    
-                    # Parse operations from separate lines
-                    ord_match = orders_pattern.search(line)
-                    if ord_match: stats["orders"] += int(ord_match.group(1))
-                    
-                    cnl_match = cancels_pattern.search(line)
-                    if cnl_match: stats["cancels"] += int(cnl_match.group(1))
-                    
-                    fil_match = fills_pattern.search(line)
-                    if fil_match: stats["fills"] += int(fil_match.group(1))
+                        elif current_entry_time and (
+                            b"%" in line or b"Orders:" in line or b"Cancels:" in line or b"Fills:" in line
+                        ):
+                            # We are inside a valid block, parse stats
+                            stripped = line.lstrip()
+                            if stripped.startswith(_COUNT_PREFIXES):
+                                label, _, rest = stripped.partition(b":")
+                                count = rest.strip()
+                                if rest[:1].isspace() and count.isdigit():
+                                    stats[_COUNT_LABELS[label]] += int(count)
+                                    continue
+                            for m in _STAT_RE.finditer(line):
+                                index = m.lastindex
+                                key = _STAT_KEYS[index]
+                                value = m.group(index)
+                                if key in _COUNT_KEYS:
+                                    stats[key] += int(value)
+                                else:
+                                    amount = float(value) * scale
+                                    stats[key] += amount
+                                    if key == "warmup_time":
+                                        stats["warmup_threshold"] = float(m.group(index - 1))
+                                    elif key.startswith("tier"):
+                                        band = _TIER_BAND_RE.search(line)
+                                        if band:
+                                            stats[band.lastgroup] += amount
+            except (OSError, ValueError):
+                # Unreadable, or empty (mmap refuses zero-length files)
+                continue
+
+            if reached_cutoff:
+                # Rotated files only hold older reports
+                break
 
     except Exception as e:
         logger.error(f"Error parsing log: {e}")
         return None
         
+    if signature is not None:
+        _parse_cache[(log_path, hours)] = (signature, oldest_entry_time, dict(stats))
     return stats
 
 
+# Report templates, rendered with str.format_map against one context dict
+_NO_DATA_TEMPLATE = (
+    "⚠️ StandX Bot Efficiency Report\n\n"
+    "No data found for the last {hours} hours. Bot may be down or logs missing."
+)
+_BALANCE_TEMPLATE = (
+    "*Account:*\n"
+    "💰 Equity:  ${equity:,.2f}\n"
+    "💵 Balance: ${balance:,.2f}\n"
+    "📈 PnL (Realized): ${pnl:,.2f}\n\n"
+)
+_REPORT_HEADER = (
+    "📊 *StandX Bot Efficiency Report (Last {hours}h)*\n"
+    "⏱️ Duration Monitored: {duration_hours:.1f} hours\n\n"
+    "{balance_section}"
+)
+_REPORT_OPERATIONS = (
+    "*Operations:*\n"
+    "📥 Total Orders:  {orders} ({orders_per_hour:.0f}/h)\n"
+    "🔄 Total Cancels: {cancels} ({cancels_per_hour:.0f}/h)\n"
+    "✅ Total Fills:   {fills}\n"
+)
+_POINTS_TEMPLATE = (
+    _REPORT_HEADER
+    + "*Points Bands (Notional-weighted):*\n"
+    "🟢 0-10bps (100%):  *{b1_pct:.1f}%*\n"
+    "🟡 10-30bps (50%): {b2_pct:.1f}%\n"
+    "🔴 >30bps (0%):     {bout_pct:.1f}%\n"
+    "🟤 Warmup (<{warmup_threshold:.0f}s): {warmup_pct:.1f}%\n\n"
+    "*Points Efficiency:*\n"
+    "✅ Eligible Ratio:      {eligible_pct:.1f}%\n"
+    "⭐ Weighted Efficiency: {weighted_pct:.1f}%\n\n"
+    + _REPORT_OPERATIONS
+)
+_TIERS_TEMPLATE = (
+    _REPORT_HEADER
+    + "*Spread Efficiency:*\n"
+    "🟢 Tier 1 (0-10bps):  *{t1_pct:.1f}%*\n"
+    "🟡 Tier 2 (10-30bps): {t2_pct:.1f}%\n"
+    "🟠 Tier 3 (30-100bps):{t3_pct:.1f}%\n"
+    "🔴 Inefficient:       {t4_pct:.1f}%\n\n"
+    + _REPORT_OPERATIONS
+)
+
+
 def generate_efficiency_report_text(stats: dict, hours: int, balance_data: dict = None, realized_pnl: float = None) -> str:
     """Generate formatted efficiency report text."""
     if not stats or stats["total_time"] == 0:
-        return f"⚠️ StandX Bot Efficiency Report\n\nNo data found for the last {hours} hours. Bot may be down or logs missing."
+        return _NO_DATA_TEMPLATE.format_map({"hours": hours})
     
-    # Calculate percentages
+    # Duration in hours
     total = stats["total_time"]
+    duration_hours = total / 3600
+    ctx = {
+        "hours": hours,
+        "duration_hours": duration_hours,
+        "balance_section": "",
+        "orders": stats["orders"],
+        "cancels": stats["cancels"],
+        "fills": stats["fills"],
+        "orders_per_hour": stats["orders"] / duration_hours if duration_hours > 0 else 0,
+        "cancels_per_hour": stats["cancels"] / duration_hours if duration_hours > 0 else 0,
+    }
+    
+    if balance_data:
+        # PnL shows the accumulated realized PnL from the Position API when
+        # given; otherwise fall back to the balance payload's upnl
+        upnl = float(balance_data.get("upnl", 0) or 0)
+        ctx["balance_section"] = _BALANCE_TEMPLATE.format_map({
+            "equity": float(balance_data.get("equity", 0) or 0),
+            "balance": float(balance_data.get("balance", 0) or 0),
+            "pnl": realized_pnl if realized_pnl is not None else upnl,
+        })
+    
+    # Calculate percentages
     use_points = (
         stats["band_0_10_time"]
         + stats["band_10_30_time"]
@@ -176,75 +316,20 @@ def generate_efficiency_report_text(stats: dict, hours: int, balance_data: dict
         + stats["warmup_time"]
     ) > 0
     if use_points:
-        b1_pct = stats["band_0_10_time"] / total * 100
-        b2_pct = stats["band_10_30_time"] / total * 100
-        bout_pct = stats["band_out_time"] / total * 100
-        warmup_pct = stats["warmup_time"] / total * 100
-        eligible_pct = stats["eligible_ratio_time"] / total * 100
-        weighted_pct = stats["weighted_efficiency_time"] / total * 100
-    else:
-        t1_pct = stats["tier1_time"] / total * 100
-        t2_pct = stats["tier2_time"] / total * 100
-        t3_pct = stats["tier3_time"] / total * 100
-        t4_pct = stats["tier4_time"] / total * 100
-    
-    # Duration in hours
-    duration_hours = total / 3600
-    orders_per_hour = stats['orders'] / duration_hours if duration_hours > 0 else 0
-    cancels_per_hour = stats['cancels'] / duration_hours if duration_hours > 0 else 0
-    
-    balance_section = ""
-    if balance_data:
-        equity = float(balance_data.get("equity", 0) or 0)
-        bal = float(balance_data.get("balance", 0) or 0)
-        upnl = float(balance_data.get("upnl", 0) or 0)
-        if realized_pnl is not None:
-             upnl = realized_pnl # Use provided realized pnl from Position API
-        else:
-             # Fallback or use un-realized from balance? NO, user asked for accumulated realized.
-             # Balance data usually has 'upnl' (unrealized) and 'pnl_freeze' (realized).
-             # If realized_pnl param is passed, we use it as "PnL" display.
-             pass
-             
-        balance_section = (
-            f"*Account:*\n"
-            f"💰 Equity:  ${equity:,.2f}\n"
-            f"💵 Balance: ${bal:,.2f}\n"
-            f"📈 PnL (Realized): ${upnl:,.2f}\n\n"
-        )
-    
-    if use_points:
-        warmup_threshold = stats["warmup_threshold"] or 3
-        message = (
-            f"📊 *StandX Bot Efficiency Report (Last {hours}h)*\n"
-            f"⏱️ Duration Monitored: {duration_hours:.1f} hours\n\n"
-            f"{balance_section}"
-            f"*Points Bands (Notional-weighted):*\n"
-            f"🟢 0-10bps (100%):  *{b1_pct:.1f}%*\n"
-            f"🟡 10-30bps (50%): {b2_pct:.1f}%\n"
-            f"🔴 >30bps (0%):     {bout_pct:.1f}%\n"
-            f"🟤 Warmup (<{warmup_threshold:.0f}s): {warmup_pct:.1f}%\n\n"
-            f"*Points Efficiency:*\n"
-            f"✅ Eligible Ratio:      {eligible_pct:.1f}%\n"
-            f"⭐ Weighted Efficiency: {weighted_pct:.1f}%\n\n"
-            f"*Operations:*\n"
-            f"📥 Total Orders:  {stats['orders']} ({orders_per_hour:.0f}/h)\n"
-            f"🔄 Total Cancels: {stats['cancels']} ({cancels_per_hour:.0f}/h)\n"
-            f"✅ Total Fills:   {stats['fills']}\n"
-        )
-    else:
-        message = (
-            f"📊 *StandX Bot Efficiency Report (Last {hours}h)*\n"
-            f"⏱️ Duration Monitored: {duration_hours:.1f} hours\n\n"
-            f"{balance_section}"
-            f"*Spread Efficiency:*\n"
-            f"🟢 Tier 1 (0-10bps):  *{t1_pct:.1f}%*\n"
-            f"🟡 Tier 2 (10-30bps): {t2_pct:.1f}%\n"
-            f"🟠 Tier 3 (30-100bps):{t3_pct:.1f}%\n"
-            f"🔴 Inefficient:       {t4_pct:.1f}%\n\n"
-            f"*Operations:*\n"
-            f"📥 Total Orders:  {stats['orders']} ({orders_per_hour:.0f}/h)\n"
-            f"🔄 Total Cancels: {stats['cancels']} ({cancels_per_hour:.0f}/h)\n"
-            f"✅ Total Fills:   {stats['fills']}\n"
+        ctx.update(
+            b1_pct=stats["band_0_10_time"] / total * 100,
+            b2_pct=stats["band_10_30_time"] / total * 100,
+            bout_pct=stats["band_out_time"] / total * 100,
+            warmup_pct=stats["warmup_time"] / total * 100,
+            eligible_pct=stats["eligible_ratio_time"] / total * 100,
+            weighted_pct=stats["weighted_efficiency_time"] / total * 100,
+            warmup_threshold=stats["warmup_threshold"] or 3,
         )
-    return message
+        return _POINTS_TEMPLATE.format_map(ctx)
+    ctx.update(
+        t1_pct=stats["tier1_time"] / total * 100,
+        t2_pct=stats["tier2_time"] / total * 100,
+        t3_pct=stats["tier3_time"] / total * 100,
+        t4_pct=stats["tier4_time"] / total * 100,
+    )
+    return _TIERS_TEMPLATE.format_map(ctx)
@@ -8,16 +8,119 @@ Maintains:
 """
 import time
 import logging
-from typing import Optional, Dict
+from typing import Optional
 from dataclasses import dataclass, field
-from threading import Lock
+from array import array
+from bisect import bisect_right
 from collections import deque
+from functools import partial
+from itertools import islice, takewhile
+from operator import gt, lt, sub
 
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+class _Window:
+    """Sliding window of (timestamp, value) samples as two array('d') columns.
+
+    Expired samples are skipped by advancing head and dropped in one batch
+    once they fill half the buffer, so expiry is O(log n) amortized and
+    readers bisect and slice contiguous doubles.
+    """
+    __slots__ = ("ts", "val", "head")
+
+    def __init__(self):
+        self.ts = array("d")
+        self.val = array("d")
+        self.head = 0
+
+    def __len__(self) -> int:
+        return len(self.ts) - self.head
+
+    def append(self, t: float, v: float):
+        self.ts.append(t)
+        self.val.append(v)
+
+    def expire(self, cutoff: float):
+        """Drop samples stamped at or before cutoff."""
+        head = bisect_right(self.ts, cutoff, self.head)
+        if head * 2 > len(self.ts):
+            del self.ts[:head]
+            del self.val[:head]
+            head = 0
+        self.head = head
+
+    def start(self, cutoff: float) -> int:
+        """Index of the first live sample stamped after cutoff."""
+        return bisect_right(self.ts, cutoff, self.head)
+
+
+class _SumWindow(_Window):
+    """_Window with a running prefix sum of the values.
+
+    sum(start, end) is two reads instead of a pass over the slice. Prefixes
+    are rebased at compaction so their magnitude stays bounded, and a run
+    of zero samples leaves the prefix unchanged, so a flat stretch sums to
+    exactly 0.0.
+    """
+    __slots__ = ("cum",)
+
+    def __init__(self):
+        super().__init__()
+        self.cum = array("d")
+
+    def append(self, t: float, v: float):
+        self.ts.append(t)
+        self.val.append(v)
+        self.cum.append(self.cum[-1] + v if self.cum else v)
+
+    def expire(self, cutoff: float):
+        """Drop samples stamped at or before cutoff."""
+        head = bisect_right(self.ts, cutoff, self.head)
+        if head * 2 > len(self.ts):
+            base = self.cum[head - 1] if head else 0.0
+            del self.ts[:head]
+            del self.val[:head]
+            del self.cum[:head]
+            if base:
+                self.cum = array("d", [c - base for c in self.cum])
+            head = 0
+        self.head = head
+
+    def sum(self, start: int, end: Optional[int] = None) -> float:
+        """Sum of values[start:end] over live indices."""
+        cum = self.cum
+        if end is None:
+            end = len(cum)
+        if end <= start:
+            return 0.0
+        return cum[end - 1] - cum[start - 1] if start else cum[end - 1]
+
+
+# side -> (sign applied to order.price - cex_price, log wording)
+_CEX_CROSS_SIDES = {"buy": (-1.0, "at/below"), "sell": (1.0, "at/above")}
+
+
+def _push_extreme(max_dq: deque, min_dq: deque, t: float, p: float):
+    """Append a sample to monotonic max/min deques of (timestamp, price)."""
+    while max_dq and max_dq[-1][1] <= p:
+        max_dq.pop()
+    max_dq.append((t, p))
+    while min_dq and min_dq[-1][1] >= p:
+        min_dq.pop()
+    min_dq.append((t, p))
+
+
+def _expire_extremes(max_dq: deque, min_dq: deque, cutoff: float):
+    """Drop samples at or before cutoff; the heads are then the window max/min."""
+    while max_dq and max_dq[0][0] <= cutoff:
+        max_dq.popleft()
+    while min_dq and min_dq[0][0] <= cutoff:
+        min_dq.popleft()
+
+
+@dataclass(slots=True)
 class OpenOrder:
     """Represents an open order we're tracking."""
     cl_ord_id: str
@@ -28,7 +131,7 @@ class OpenOrder:
     created_at: float = field(default_factory=time.time)
 
 
-@dataclass
+@dataclass(slots=True)
 class State:
     """Bot state container."""
     
@@ -37,13 +140,20 @@ class State:
     last_cex_price: Optional[float] = None
     last_dex_update_time: float = 0.0
     last_cex_update_time: float = 0.0
-    cex_price_window: deque = field(default_factory=deque)  # [(timestamp, price), ...]
-    dex_price_window: deque = field(default_factory=deque)  # [(timestamp, price), ...]
-    cex_volume_window: deque = field(default_factory=deque)  # [(timestamp, notional), ...]
+    dex_bps_factor: float = 0.0  # 10000 / last_dex_price, cached for bps distance math
+    # Sliding windows as parallel timestamp / value columns so scans touch
+    # only the field they need and max/min/sum run over plain floats.
+    # Window timestamps and last_*_update_time are time.monotonic() so a
+    # wall-clock step cannot mass-expire or freeze a window.
+    cex_prices: _Window = field(default_factory=_Window)
+    dex_prices: _Window = field(default_factory=_Window)
+    # Running max/min of CEX prices for windows queried every tick
+    _cex_extremes: dict = field(default_factory=dict)  # {window_sec: (max_deque, min_deque)}
+    cex_volumes: _SumWindow = field(default_factory=_SumWindow)
     last_cex_volume_update_time: float = 0.0
     
     # Orderbook imbalance data
-    imbalance_window: deque = field(default_factory=deque)  # [(timestamp, imbalance), ...]
+    imbalances: _SumWindow = field(default_factory=_SumWindow)
     last_imbalance: float = 0.0
     last_imbalance_update_time: float = 0.0
     
@@ -53,12 +163,12 @@ class State:
     
     # Execution tracking
     last_fill_time: float = 0.0
+    fill_seq: int = 0  # bumped by every record_fill, for cheap "recorded since?" checks
     
-    # Open orders (one buy, one sell max)
-    open_orders: Dict[str, Optional[OpenOrder]] = field(default_factory=lambda: {"buy": None, "sell": None})
+    # Open orders (one buy, one sell max), one slot per side
+    buy_order: Optional[OpenOrder] = None
+    sell_order: Optional[OpenOrder] = None
     
-    # Lock for thread safety
-    _lock: Lock = field(default_factory=Lock)
     _volume_ratio_cache_key: tuple = field(default_factory=tuple)
     _volume_ratio_cache_val: tuple = field(default_factory=tuple)
     
@@ -69,15 +179,12 @@ class State:
 
     def update_dex_price(self, price: float, window_sec: int = 3600):
         """Update DEX price (Anchor for orders) and maintain sliding window."""
-        with self._lock:
-            now = time.time()
-            self.last_dex_price = price
-            self.last_dex_update_time = now
-            self.dex_price_window.append((now, price))
-
-            cutoff = now - window_sec
-            while self.dex_price_window and self.dex_price_window[0][0] <= cutoff:
-                self.dex_price_window.popleft()
+        now = time.monotonic()
+        self.last_dex_price = price
+        self.dex_bps_factor = 10000.0 / price if price > 0 else 0.0
+        self.last_dex_update_time = now
+        self.dex_prices.append(now, price)
+        self.dex_prices.expire(now - window_sec)
 
     def update_cex_price(self, price: float, window_sec: int = 3600):
         """Update CEX price (Source for Volatility) and maintain sliding window.
@@ -85,88 +192,80 @@ class State:
         Note: We keep a longer history (default 1h) to support both 
         short-term guard (5s) and long-term recovery checks (5m+).
         """
-        with self._lock:
-            now = time.time()
-            self.last_cex_price = price
-            self.last_cex_update_time = now
-            self.cex_price_window.append((now, price))
-            
-            # Clean up old data using efficient deque popleft
-            cutoff = now - window_sec
-            while self.cex_price_window and self.cex_price_window[0][0] <= cutoff:
-                self.cex_price_window.popleft()
+        now = time.monotonic()
+        self.last_cex_price = price
+        self.last_cex_update_time = now
+        self.cex_prices.append(now, price)
+        
+        # Clean up old data
+        cutoff = now - window_sec
+        self.cex_prices.expire(cutoff)
+
+        for tracked_sec, (max_dq, min_dq) in self._cex_extremes.items():
+            _push_extreme(max_dq, min_dq, now, price)
+            _expire_extremes(max_dq, min_dq, max(cutoff, now - tracked_sec))
+
+    def track_cex_extremes(self, window_sec: float):
+        """Keep a running max/min of CEX prices so that window is an O(1) read.
+
+        Serves get_cex_amplitude(window_sec) and get_volatility_bps(window_sec)
+        whenever the latter resolves to the CEX window.
+        """
+        if not window_sec or window_sec <= 0 or window_sec in self._cex_extremes:
+            return
+        max_dq, min_dq = deque(), deque()
+        window = self.cex_prices
+        for t, p in zip(window.ts[window.head:], window.val[window.head:]):
+            _push_extreme(max_dq, min_dq, t, p)
+        self._cex_extremes[window_sec] = (max_dq, min_dq)
 
     def update_cex_volume(self, notional: float, window_sec: int = 3600):
         """Update CEX notional volume (1s kline) and maintain sliding window."""
-        with self._lock:
-            now = time.time()
-            self.last_cex_volume_update_time = now
-            self.cex_volume_window.append((now, notional))
-
-            cutoff = now - window_sec
-            while self.cex_volume_window and self.cex_volume_window[0][0] <= cutoff:
-                self.cex_volume_window.popleft()
+        now = time.monotonic()
+        self.last_cex_volume_update_time = now
+        self.cex_volumes.append(now, notional)
+        self.cex_volumes.expire(now - window_sec)
 
     def get_cex_volume_ratio(self, window_sec: int, min_samples: int) -> tuple[float, float, float, int]:
         """
         Return volume ratio vs baseline: (ratio, current, average, sample_count).
         Ratio is computed against the average of the baseline window excluding current.
         """
-        with self._lock:
-            cache_key = (self.last_cex_volume_update_time, window_sec, min_samples)
-            if cache_key == self._volume_ratio_cache_key:
-                return self._volume_ratio_cache_val
-
-            if not self.cex_volume_window:
-                result = (0.0, 0.0, 0.0, 0)
-                self._volume_ratio_cache_key = cache_key
-                self._volume_ratio_cache_val = result
-                return result
-
-            now = time.time()
-            cutoff = now - window_sec
-            
-            current = None
-            baseline_sum = 0.0
-            baseline_count = 0
-            sample_count = 0
-
-            # Efficient O(k) reverse iteration
-            # Note: samples are processed newest first
-            for t, v in reversed(self.cex_volume_window):
-                if t <= cutoff:
-                    break
-                if current is None:
-                    current = v
-                else:
-                    baseline_sum += v
-                    baseline_count += 1
-                sample_count += 1
-
-            if current is None:
-                result = (0.0, 0.0, 0.0, 0)
-                self._volume_ratio_cache_key = cache_key
-                self._volume_ratio_cache_val = result
-                return result
-
-            if baseline_count < min_samples:
-                result = (0.0, 0.0, 0.0, sample_count)
-                self._volume_ratio_cache_key = cache_key
-                self._volume_ratio_cache_val = result
-                return result
-            
-            avg = baseline_sum / baseline_count if baseline_count else 0.0
-            if avg <= 0:
-                result = (0.0, current, avg, baseline_count)
-                self._volume_ratio_cache_key = cache_key
-                self._volume_ratio_cache_val = result
-                return result
-
-            ratio = current / avg
-            result = (ratio, current, avg, baseline_count)
+        cache_key = (self.last_cex_volume_update_time, window_sec, min_samples)
+        if cache_key == self._volume_ratio_cache_key:
+            return self._volume_ratio_cache_val
+
+        window = self.cex_volumes
+        start = window.start(time.monotonic() - window_sec)
+        sample_count = len(window.ts) - start
+        if sample_count == 0:
+            result = (0.0, 0.0, 0.0, 0)
+            self._volume_ratio_cache_key = cache_key
+            self._volume_ratio_cache_val = result
+            return result
+
+        # Newest sample is the current bar, the rest the baseline
+        current = window.val[-1]
+        baseline_count = sample_count - 1
+        if baseline_count < min_samples:
+            result = (0.0, 0.0, 0.0, sample_count)
             self._volume_ratio_cache_key = cache_key
             self._volume_ratio_cache_val = result
             return result
+        
+        baseline_sum = window.sum(start, len(window.ts) - 1)
+        avg = baseline_sum / baseline_count if baseline_count else 0.0
+        if avg <= 0:
+            result = (0.0, current, avg, baseline_count)
+            self._volume_ratio_cache_key = cache_key
+            self._volume_ratio_cache_val = result
+            return result
+
+        ratio = current / avg
+        result = (ratio, current, avg, baseline_count)
+        self._volume_ratio_cache_key = cache_key
+        self._volume_ratio_cache_val = result
+        return result
 
     def update_imbalance(self, bid_depth: float, ask_depth: float, window_sec: int = 10):
         """Update orderbook imbalance data and maintain sliding window.
@@ -176,18 +275,14 @@ class State:
             ask_depth: Sum of ask quantities
             window_sec: Time window to keep history
         """
-        with self._lock:
-            now = time.time()
-            total = bid_depth + ask_depth
-            imbalance = (bid_depth - ask_depth) / total if total > 0 else 0.0
-            
-            self.last_imbalance = imbalance
-            self.last_imbalance_update_time = now
-            self.imbalance_window.append((now, imbalance))
-            
-            cutoff = now - window_sec
-            while self.imbalance_window and self.imbalance_window[0][0] <= cutoff:
-                self.imbalance_window.popleft()
+        now = time.monotonic()
+        total = bid_depth + ask_depth
+        imbalance = (bid_depth - ask_depth) / total if total > 0 else 0.0
+        
+        self.last_imbalance = imbalance
+        self.last_imbalance_update_time = now
+        self.imbalances.append(now, imbalance)
+        self.imbalances.expire(now - window_sec)
 
     def get_imbalance_signal(self, window_sec: int, threshold: float) -> int:
         """Detect sustained imbalance direction in orderbook.
@@ -213,36 +308,23 @@ class State:
 
     def get_imbalance_stats(self, window_sec: int) -> tuple[float, int]:
         """Return average imbalance and sample count for the window."""
-        with self._lock:
-            if not self.imbalance_window:
-                return 0.0, 0
-            
-            now = time.time()
-            cutoff = now - window_sec
-            
-            # Efficient O(k) reverse iteration without list allocation
-            count = 0
-            imbalance_sum = 0.0
-            for t, v in reversed(self.imbalance_window):
-                if t <= cutoff:
-                    break
-                imbalance_sum += v
-                count += 1
-            
-            if count == 0:
-                return 0.0, 0
-            
-            avg_imbalance = imbalance_sum / count
-            return avg_imbalance, count
+        window = self.imbalances
+        start = window.start(time.monotonic() - window_sec)
+        count = len(window.ts) - start
+        if count == 0:
+            return 0.0, 0
+        
+        avg_imbalance = window.sum(start) / count
+        return avg_imbalance, count
 
-    def _get_window(self, source: str):
+    def _get_window(self, source: str) -> _Window:
         if source == "cex":
-            return self.cex_price_window
+            return self.cex_prices
         if source == "dex":
-            return self.dex_price_window
-        if self.cex_price_window:
-            return self.cex_price_window
-        return self.dex_price_window
+            return self.dex_prices
+        if self.cex_prices:
+            return self.cex_prices
+        return self.dex_prices
 
     def get_volatility_bps(self, window_sec: Optional[int] = None, source: str = "auto") -> float:
         """
@@ -254,87 +336,82 @@ class State:
         Returns:
             Volatility in basis points, or 0 if insufficient data
         """
-        with self._lock:
-            window = self._get_window(source)
-            if not window:
+        window = self._get_window(source)
+        if not window:
+            return 0.0
+        
+        tracked = self._cex_extremes.get(window_sec) if window is self.cex_prices else None
+        if tracked:
+            cutoff = time.monotonic() - window_sec
+            # At least two samples in the window (timestamps are ascending)
+            if len(window) < 2 or window.ts[-2] <= cutoff:
                 return 0.0
-                
-            now = time.time()
-            min_p = None
-            max_p = None
-            current_price = None
-            sample_count = 0
-            
-            if window_sec:
-                cutoff = now - window_sec
-                # Efficient O(k) reverse iteration without list allocation
-                for t, p in reversed(window):
-                    if t <= cutoff:
-                        break
-                    if current_price is None:
-                        current_price = p
-                    if min_p is None or p < min_p:
-                        min_p = p
-                    if max_p is None or p > max_p:
-                        max_p = p
-                    sample_count += 1
-            else:
-                # Full window scan
-                for _, p in window:
-                    if min_p is None or p < min_p:
-                        min_p = p
-                    if max_p is None or p > max_p:
-                        max_p = p
-                    sample_count += 1
-                current_price = window[-1][1] if window else None
-            
-            if sample_count < 2 or current_price is None:
+            max_dq, min_dq = tracked
+            _expire_extremes(max_dq, min_dq, cutoff)
+            max_p = max_dq[0][1]
+            min_p = min_dq[0][1]
+        else:
+            # Bisect to the window start, then max/min over the contiguous slice
+            start = window.start(time.monotonic() - window_sec) if window_sec else window.head
+            if len(window.ts) - start < 2:
                 return 0.0
-            
-            if current_price == 0:
-                return float("inf")
-            
-            volatility = (max_p - min_p) / current_price * 10000
-            return volatility
+            prices = window.val[start:]
+            max_p = max(prices)
+            min_p = min(prices)
+        current_price = window.val[-1]
+        
+        if current_price == 0:
+            return float("inf")
+        
+        volatility = (max_p - min_p) / current_price * 10000
+        return volatility
+    
+    def get_spread_bps(self) -> float:
+        """
+        Calculate the CEX/DEX price spread in bps (relative to the DEX price).
+        
+        Returns:
+            Spread in basis points, or 0 until both prices are known
+        """
+        if not self.last_cex_price or not self.last_dex_price:
+            return 0.0
+        return abs(self.last_cex_price - self.last_dex_price) * self.dex_bps_factor
     
     def get_cex_amplitude(self, window_sec: int) -> float:
         """
         Calculate Realized Amplitude: (Max - Min) / Mid
         Returns amplitude in BPS.
         """
-        with self._lock:
-            if not self.cex_price_window:
-                return 0.0
-            
-            now = time.time()
-            cutoff = now - window_sec
-            min_p = None
-            max_p = None
-            sample_count = 0
-            for t, p in reversed(self.cex_price_window):
-                if t <= cutoff:
-                    break
-                if min_p is None or p < min_p:
-                    min_p = p
-                if max_p is None or p > max_p:
-                    max_p = p
-                sample_count += 1
-            
-            if sample_count == 0 or min_p is None or max_p is None:
+        cutoff = time.monotonic() - window_sec
+        tracked = self._cex_extremes.get(window_sec)
+        if tracked:
+            max_dq, min_dq = tracked
+            _expire_extremes(max_dq, min_dq, cutoff)
+            if not max_dq:
                 return 0.0
-            
-            if min_p == 0: 
+            max_p = max_dq[0][1]
+            min_p = min_dq[0][1]
+        else:
+            window = self.cex_prices
+            start = window.start(cutoff)
+            if start == len(window.ts):
                 return 0.0
-                
-            mid_p = (max_p + min_p) / 2
+            prices = window.val[start:]
+            max_p = max(prices)
+            min_p = min(prices)
+        
+        if min_p == 0: 
+            return 0.0
             
-            if mid_p == 0:
-                return 0.0
-                
-            # Amplitude ratio
-            amp = (max_p - min_p) / mid_p
-            return amp * 10000 # Convert to bps
+        mid_p = (max_p + min_p) / 2
+        
+        if mid_p == 0:
+            return 0.0
             
+        # Amplitude ratio
+        amp = (max_p - min_p) / mid_p
+        return amp * 10000 # Convert to bps
+        
     def check_cex_velocity(self, window_sec: float, threshold_ticks: int) -> bool:
         """
         Check if price is moving too fast (consecutive ticks in same direction).
@@ -346,121 +423,107 @@ class State:
         Returns:
             True if velocity/trend detected, False otherwise
         """
-        with self._lock:
-            direction, count = self._get_consecutive_run(self.cex_price_window, window_sec)
-            return direction != 0 and count >= threshold_ticks
+        direction, count = self._get_consecutive_run(self.cex_prices, window_sec)
+        return direction != 0 and count >= threshold_ticks
 
     def get_trend_direction(self, window_sec: float, threshold_ticks: int, source: str = "auto") -> int:
         """
         Return trend direction based on consecutive ticks.
         1 for up, -1 for down, 0 for no clear trend.
         """
-        with self._lock:
-            window = self._get_window(source)
-            return self._get_consecutive_direction(window, window_sec, threshold_ticks)
+        window = self._get_window(source)
+        return self._get_consecutive_direction(window, window_sec, threshold_ticks)
 
     def get_trend_run(self, window_sec: float, source: str = "auto") -> tuple[int, int]:
         """
         Return consecutive trend direction and count from newest ticks.
         Direction: 1 for up, -1 for down, 0 for none; count: number of consecutive moves.
         """
-        with self._lock:
-            window = self._get_window(source)
-            return self._get_consecutive_run(window, window_sec)
+        window = self._get_window(source)
+        return self._get_consecutive_run(window, window_sec)
 
-    def _get_consecutive_direction(self, window: list, window_sec: float, threshold_ticks: int) -> int:
+    def _get_consecutive_direction(self, window: _Window, window_sec: float, threshold_ticks: int) -> int:
         direction, count = self._get_consecutive_run(window, window_sec)
         if count >= threshold_ticks:
             return direction
         return 0
 
-    def _get_consecutive_run(self, window: list, window_sec: float) -> tuple[int, int]:
+    def _get_consecutive_run(self, window: _Window, window_sec: float) -> tuple[int, int]:
         if len(window) < 2:
             return 0, 0
 
-        now = time.time()
-        cutoff = now - window_sec
-        sample_count = 0
-        target_count = 0
-        direction = 0  # 1 for up, -1 for down
-        prev_p = None
-
-        # Iterate newest -> oldest, track consecutive direction without list allocation
-        for t, p in reversed(window):
-            if t <= cutoff:
-                break
-            if prev_p is None:
-                prev_p = p
-                sample_count = 1
-                continue
-
-            sample_count += 1
-            diff = prev_p - p
-            prev_p = p
-
-            if diff == 0:
-                continue
-
-            curr_dir = 1 if diff > 0 else -1
-
-            if direction == 0:
-                direction = curr_dir
-                target_count = 1
-            elif curr_dir == direction:
-                target_count += 1
-            else:
-                break
-
+        prices = window.val
+        sample_count = len(window.ts) - window.start(time.monotonic() - window_sec)
         if sample_count < 2:
             return 0, 0
 
-        return direction, target_count
+        # Tick-to-tick moves newest -> oldest (newer minus older), with flat
+        # ticks dropped; differencing and filtering run in C iterators
+        moves = filter(None, map(
+            sub,
+            islice(reversed(prices), sample_count - 1),
+            islice(reversed(prices), 1, sample_count),
+        ))
+        first = next(moves, None)
+        if first is None:
+            return 0, 0
+
+        # The run is the newest move plus every following move of the same
+        # sign; takewhile stops at the first reversal without a per-tick branch
+        if first > 0:
+            direction, same_way = 1, partial(lt, 0.0)
+        else:
+            direction, same_way = -1, partial(gt, 0.0)
+        return direction, 1 + sum(1 for _ in takewhile(same_way, moves))
     
     def update_position(self, qty: float, entry_price: float = 0.0):
         """Update position quantity and entry price."""
-        with self._lock:
-            self.position = qty
-            self.entry_price = entry_price
-            logger.info(f"Position updated: {qty} @ {entry_price}")
+        self.position = qty
+        self.entry_price = entry_price
+        logger.info("Position updated: %s @ %s", qty, entry_price)
     
     def record_fill(self):
         """Record the time of a fill."""
-        with self._lock:
-            self.last_fill_time = time.time()
-            logger.info(f"Recorded fill at {self.last_fill_time}")
+        self.last_fill_time = time.time()
+        self.fill_seq += 1
+        logger.info("Recorded fill at %s", self.last_fill_time)
     
     def set_order(self, side: str, order: Optional[OpenOrder]):
         """Set or clear an open order."""
-        with self._lock:
-            self.open_orders[side] = order
-            if order:
-                logger.info(f"Order set: {side} {order.qty} @ {order.price} (cl_ord_id: {order.cl_ord_id})")
-            else:
-                logger.info(f"Order cleared: {side}")
+        if side == "buy":
+            self.buy_order = order
+        else:
+            self.sell_order = order
+        if order:
+            logger.info("Order set: %s %s @ %s (cl_ord_id: %s)", side, order.qty, order.price, order.cl_ord_id)
+        else:
+            logger.info("Order cleared: %s", side)
 
     def update_order_qty(self, side: str, qty: float):
         """Update open order quantity."""
-        with self._lock:
-            order = self.open_orders.get(side)
-            if order:
-                order.qty = qty
-                logger.info(f"Order qty updated: {side} {qty}")
+        order = self.buy_order if side == "buy" else self.sell_order
+        if order:
+            order.qty = qty
+            logger.info("Order qty updated: %s %s", side, qty)
     
     def get_order(self, side: str) -> Optional[OpenOrder]:
         """Get current order for a side."""
-        with self._lock:
-            return self.open_orders.get(side)
+        return self.buy_order if side == "buy" else self.sell_order
     
     def has_order(self, side: str) -> bool:
         """Check if we have an order on a side."""
-        with self._lock:
-            return self.open_orders.get(side) is not None
+        return (self.buy_order if side == "buy" else self.sell_order) is not None
     
     def clear_all_orders(self):
         """Clear all tracked orders."""
-        with self._lock:
-            self.open_orders = {"buy": None, "sell": None}
-            logger.info("All orders cleared")
+        self.buy_order = None
+        self.sell_order = None
+        logger.info("All orders cleared")
+    
+    def snapshot_open_order_ids(self) -> tuple[Optional[str], Optional[str]]:
+        """Return (buy cl_ord_id, sell cl_ord_id), None for an empty side."""
+        buy, sell = self.buy_order, self.sell_order
+        return (buy.cl_ord_id if buy else None, sell.cl_ord_id if sell else None)
     
     def get_orders_to_cancel(self, buy_bounds: tuple, sell_bounds: tuple, min_rest_sec: float = 0.0) -> dict:
         """
@@ -476,89 +539,85 @@ class State:
               - 'orders': List of orders to cancel
               - 'cex_triggered_sides': List of sides cancelled due to CEX danger
         """
-        with self._lock:
-            if self.last_dex_price is None:
-                return {'orders': [], 'cex_triggered_sides': []}
+        # Snapshot once so the distance math below sees one consistent view
+        dex_price = self.last_dex_price
+        inv_dex = self.dex_bps_factor
+        cex_price = self.last_cex_price
+        orders = (("buy", self.buy_order), ("sell", self.sell_order))
+        if dex_price is None:
+            return {'orders': [], 'cex_triggered_sides': []}
+        # bps per unit of price, so the per-order distances are multiplies
+        inv_cex = 10000.0 / cex_price if cex_price and cex_price > 0 else 0.0
+        
+        to_cancel = []
+        cex_triggered_sides = []
+        now = time.time()
+        
+        for side, order in orders:
+            if order is None:
+                continue
             
-            to_cancel = []
-            cex_triggered_sides = []
-            now = time.time()
+            # Determine bounds for this side
+            if side == "buy":
+                min_dist, max_dist = buy_bounds
+            else:
+                min_dist, max_dist = sell_bounds
             
-            for side, order in self.open_orders.items():
-                if order is None:
-                    continue
-                
-                # Determine bounds for this side
-                if side == "buy":
-                    min_dist, max_dist = buy_bounds
-                else:
-                    min_dist, max_dist = sell_bounds
-                
-                # Calculate distance from DEX price (primary reference for order placement)
-                dex_distance_bps = abs(order.price - self.last_dex_price) / self.last_dex_price * 10000
-                order_age = max(0.0, now - getattr(order, "created_at", now))
-
-                # Exit orders should not be pulled when price gets close / crosses.
-                # Keep only "too far" repricing logic to preserve fill probability.
-                if order.reduce_only:
-                    if dex_distance_bps > max_dist:
-                        logger.warning(
-                            f"Exit order too far (DEX): {side} @ {order.price:.2f}, "
-                            f"dex={self.last_dex_price:.2f}, distance={dex_distance_bps:.2f}bps > {max_dist:.2f}bps"
-                        )
-                        to_cancel.append(order)
-                    continue
-                
-                # CEX check: only trigger cancel when CEX HAS CROSSED or is ABOUT TO CROSS the order
-                # Use a tight threshold (2 bps) to avoid false positives from normal DEX/CEX spread
-                CEX_DANGER_THRESHOLD_BPS = 2.0  # Only panic if CEX is within 2 bps of order
-                cex_in_danger = False
-                if self.last_cex_price and self.last_cex_price > 0:
-                    if side == "buy":
-                        # Buy order danger: CEX price has fallen to within 2 bps of order or below
-                        cex_to_order = self.last_cex_price - order.price
-                        cex_to_order_bps = cex_to_order / self.last_cex_price * 10000
-                        if cex_to_order_bps < CEX_DANGER_THRESHOLD_BPS:
-                            cex_in_danger = True
-                            logger.warning(
-                                f"CEX CROSSED (buy): CEX={self.last_cex_price:.2f} at/below order={order.price:.2f}, "
-                                f"gap={cex_to_order_bps:.2f}bps"
-                            )
-                    else:  # sell
-                        # Sell order danger: CEX price has risen to within 2 bps of order or above
-                        cex_to_order = order.price - self.last_cex_price
-                        cex_to_order_bps = cex_to_order / self.last_cex_price * 10000
-                        if cex_to_order_bps < CEX_DANGER_THRESHOLD_BPS:
-                            cex_in_danger = True
-                            logger.warning(
-                                f"CEX CROSSED (sell): CEX={self.last_cex_price:.2f} at/above order={order.price:.2f}, "
-                                f"gap={cex_to_order_bps:.2f}bps"
-                            )
-                
-                # Decision: cancel if DEX says too close OR CEX is in danger zone.
-                # Use a near-cancel hysteresis to keep orders closer to market for better maker fill quality.
-                near_cancel_bps = max(0.0, min_dist * 0.8)
-                if dex_distance_bps < near_cancel_bps:
-                    if min_rest_sec > 0 and order_age < min_rest_sec:
-                        logger.debug(
-                            f"Keep fresh order near market: {side} @ {order.price:.2f}, "
-                            f"age={order_age:.2f}s < rest={min_rest_sec:.2f}s, distance={dex_distance_bps:.2f}bps"
-                        )
-                        continue
+            # Calculate distance from DEX price (primary reference for order placement)
+            dex_distance_bps = abs(order.price - dex_price) * inv_dex
+            order_age = max(0.0, now - getattr(order, "created_at", now))
+
+            # Exit orders should not be pulled when price gets close / crosses.
+            # Keep only "too far" repricing logic to preserve fill probability.
+            if order.reduce_only:
+                if dex_distance_bps > max_dist:
                     logger.warning(
-                        f"Order too close (DEX): {side} @ {order.price:.2f}, "
-                        f"dex={self.last_dex_price:.2f}, distance={dex_distance_bps:.2f}bps < {near_cancel_bps:.2f}bps"
+                        "Exit order too far (DEX): %s @ %.2f, dex=%.2f, distance=%.2fbps > %.2fbps",
+                        side, order.price, dex_price, dex_distance_bps, max_dist,
                     )
                     to_cancel.append(order)
-                elif cex_in_danger:
-                    # CEX triggered danger already logged above
-                    to_cancel.append(order)
-                    cex_triggered_sides.append(side)
-                elif dex_distance_bps > max_dist:
+                continue
+            
+            # CEX check: only trigger cancel when CEX HAS CROSSED or is ABOUT TO CROSS the order
+            # Use a tight threshold (2 bps) to avoid false positives from normal DEX/CEX spread
+            CEX_DANGER_THRESHOLD_BPS = 2.0  # Only panic if CEX is within 2 bps of order
+            cex_in_danger = False
+            if inv_cex:
+                # Gap from CEX to the order on the side it would be crossed from:
+                # buy danger when CEX falls to the order, sell danger when it rises
+                sign, crossed = _CEX_CROSS_SIDES[side]
+                cex_to_order_bps = sign * (order.price - cex_price) * inv_cex
+                if cex_to_order_bps < CEX_DANGER_THRESHOLD_BPS:
+                    cex_in_danger = True
                     logger.warning(
-                        f"Order too far (DEX): {side} @ {order.price:.2f}, "
-                        f"dex={self.last_dex_price:.2f}, distance={dex_distance_bps:.2f}bps > {max_dist:.2f}bps"
+                        "CEX CROSSED (%s): CEX=%.2f %s order=%.2f, gap=%.2fbps",
+                        side, cex_price, crossed, order.price, cex_to_order_bps,
                     )
-                    to_cancel.append(order)
             
-            return {'orders': to_cancel, 'cex_triggered_sides': cex_triggered_sides}
+            # Decision: cancel if DEX says too close OR CEX is in danger zone.
+            # Use a near-cancel hysteresis to keep orders closer to market for better maker fill quality.
+            near_cancel_bps = max(0.0, min_dist * 0.8)
+            if dex_distance_bps < near_cancel_bps:
+                if min_rest_sec > 0 and order_age < min_rest_sec:
+                    logger.debug(
+                        "Keep fresh order near market: %s @ %.2f, age=%.2fs < rest=%.2fs, distance=%.2fbps",
+                        side, order.price, order_age, min_rest_sec, dex_distance_bps,
+                    )
+                    continue
+                logger.warning(
+                    "Order too close (DEX): %s @ %.2f, dex=%.2f, distance=%.2fbps < %.2fbps",
+                    side, order.price, dex_price, dex_distance_bps, near_cancel_bps,
+                )
+                to_cancel.append(order)
+            elif cex_in_danger:
+                # CEX triggered danger already logged above
+                to_cancel.append(order)
+                cex_triggered_sides.append(side)
+            elif dex_distance_bps > max_dist:
+                logger.warning(
+                    "Order too far (DEX): %s @ %.2f, dex=%.2f, distance=%.2fbps > %.2fbps",
+                    side, order.price, dex_price, dex_distance_bps, max_dist,
+                )
+                to_cancel.append(order)
+        
+        return {'orders': to_cancel, 'cex_triggered_sides': cex_triggered_sides}
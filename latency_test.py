@@ -13,6 +13,12 @@ HTTP_URL = "https://perps.standx.com/api/query_symbol_price?symbol=BTC-USD"
 WS_URL = "wss://perps.standx.com/ws-stream/v1"
 ITERATIONS = 20
 
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2)
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
 async def measure_http_latency(client):
     """Measure single HTTP request latency."""
     start = time.perf_counter()
@@ -38,6 +44,22 @@ async def measure_ws_latency():
         print(f"WS Error: {e}")
         return None
 
+async def measure_ws_ping_latencies():
+    """Measure ping/pong RTT on one persistent WebSocket connection."""
+    latencies = []
+    try:
+        async with websockets.connect(WS_URL, close_timeout=1) as ws:
+            # Warmup
+            await (await ws.ping())
+            for _ in range(ITERATIONS):
+                start = time.perf_counter()
+                pong_waiter = await ws.ping()
+                await pong_waiter
+                latencies.append((time.perf_counter() - start) * 1000)  # ms
+    except Exception as e:
+        print(f"WS Ping Error: {e}")
+    return latencies
+
 def print_stats(name, latencies):
     if not latencies:
         print(f"{name}: No successful tests.")
@@ -47,10 +69,19 @@ def print_stats(name, latencies):
     max_lat = max(latencies)
     avg_lat = statistics.mean(latencies)
     stdev = statistics.stdev(latencies) if len(latencies) > 1 else 0
+    # Tail percentiles say more about quoting risk than the single max
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = latencies[0]
 
     print(f"\n[{name} Test Results ({len(latencies)} samples)]")
     print(f"  Avg:    {avg_lat:.2f} ms")
     print(f"  Min:    {min_lat:.2f} ms")
+    print(f"  P50:    {p50:.2f} ms")
+    print(f"  P95:    {p95:.2f} ms")
+    print(f"  P99:    {p99:.2f} ms")
     print(f"  Max:    {max_lat:.2f} ms")
     print(f"  Jitter: {stdev:.2f} ms")
 
@@ -61,10 +92,12 @@ async def main():
     # HTTP Test
     print(f"\nTesting HTTP RTT ({HTTP_URL})...")
     http_latencies = []
-    async with httpx.AsyncClient() as client:
+    async with httpx.AsyncClient(http2=HTTP2) as client:
         # Warmup
         await measure_http_latency(client)
         
+        # Probes stay serial so each one measures a single request, not
+        # contention with its siblings
         for i in range(ITERATIONS):
             lat = await measure_http_latency(client)
             if lat:
@@ -86,11 +119,16 @@ async def main():
             print(f"  #{i+1}: {lat:.2f} ms", end="\r")
             await asyncio.sleep(0.1)
     print(" " * 20, end="\r") # Clear line
+    
+    # Steady-state message RTT, as the maker sees it on its open streams
+    print(f"Testing WS Ping RTT ({WS_URL})...")
+    ws_ping_latencies = await measure_ws_ping_latencies()
 
     # Report
     print("="*40)
-    print_stats("HTTP REST", http_latencies)
-    print_stats("WebSocket", ws_latencies)
+    print_stats("HTTP/2 REST" if HTTP2 else "HTTP REST", http_latencies)
+    print_stats("WebSocket Connect", ws_latencies)
+    print_stats("WebSocket Ping", ws_ping_latencies)
     print("="*40)
     
     if http_latencies and statistics.mean(http_latencies) > 200:
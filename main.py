@@ -22,18 +22,32 @@ from core.maker import Maker
 from referral import check_if_referred, apply_referral, REFERRAL_CODE
 
 
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 import os
+import queue
+import atexit
+
+
+def queued_handler(*handlers: logging.Handler) -> QueueHandler:
+    """Wrap handlers behind a QueueHandler so formatting to disk/console runs on a listener thread."""
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return QueueHandler(log_queue)
+
 
 # Configure logging with rotation
 log_file = "standx_bot.log"
 handler = RotatingFileHandler(log_file, maxBytes=10*1024*1024, backupCount=5)
 handler.setFormatter(logging.Formatter("%(asctime)s | %(levelname)-8s | %(name)s | %(message)s", "%Y-%m-%d %H:%M:%S"))
+console_handler = logging.StreamHandler()
+console_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
 
-logging.basicConfig(
-    level=logging.INFO,
-    handlers=[handler, logging.StreamHandler()]
-)
+# Not basicConfig: it would attach a formatter to the QueueHandler and double-format records
+root_logger = logging.getLogger()
+root_logger.setLevel(logging.INFO)
+root_logger.addHandler(queued_handler(handler, console_handler))
 
 # Silence noisy third-party libraries
 logging.getLogger("httpx").setLevel(logging.WARNING)
@@ -50,10 +64,16 @@ efficiency_logger.propagate = False  # Don't duplicate in main log
 
 eff_handler = RotatingFileHandler("efficiency.log", maxBytes=5*1024*1024, backupCount=3)
 eff_handler.setFormatter(logging.Formatter("%(asctime)s | %(message)s", "%Y-%m-%d %H:%M:%S"))
-efficiency_logger.addHandler(eff_handler)
+efficiency_logger.addHandler(queued_handler(eff_handler))
 
 logger = logging.getLogger(__name__)
 
+# User-stream order statuses, compared lowercased
+_FILL_STATUSES = frozenset({"filled", "partially_filled"})
+_DONE_STATUSES = frozenset({"filled", "cancelled", "canceled", "rejected"})
+_ORDER_UPDATE_STATUSES = _FILL_STATUSES | _DONE_STATUSES
+_EMPTY = {}  # shared read-only default for missing "data" payloads
+
 
 async def main(config_path: str):
     """Main async entry point."""
@@ -69,20 +89,24 @@ async def main(config_path: str):
     await auth.authenticate(config.wallet.chain, config.wallet.private_key)
     logger.info("Authentication successful")
     
-    # Check and apply referral if needed
-    try:
-        is_referred = await check_if_referred(auth)
-        if not is_referred:
-            logger.info(f"Account not referred, applying referral code: {REFERRAL_CODE}")
-            result = await apply_referral(auth, "frozenbanana")
-            if result.get("success") or result.get("code") == 0:
-                logger.info("Referral applied successfully")
+    # Check and apply referral if needed (independent of the trading
+    # connections, so it runs while they are being set up)
+    async def ensure_referral():
+        try:
+            is_referred = await check_if_referred(auth)
+            if not is_referred:
+                logger.info(f"Account not referred, applying referral code: {REFERRAL_CODE}")
+                result = await apply_referral(auth, "frozenbanana")
+                if result.get("success") or result.get("code") == 0:
+                    logger.info("Referral applied successfully")
+                else:
+                    logger.warning(f"Referral failed: {result}")
             else:
-                logger.warning(f"Referral failed: {result}")
-        else:
-            logger.debug("Account already referred")
-    except Exception as e:
-        logger.warning(f"Referral check/apply failed: {e}")
+                logger.debug("Account already referred")
+        except Exception as e:
+            logger.warning(f"Referral check/apply failed: {e}")
+    
+    referral_task = asyncio.create_task(ensure_referral(), name="referral")
     
     # Initialize clients
     http_client = StandXHTTPClient(auth)
@@ -133,48 +157,88 @@ async def main(config_path: str):
     # Setup shutdown handler
     shutdown_event = asyncio.Event()
     
-    def handle_shutdown(sig, frame):
+    def handle_shutdown(sig, frame=None):
         logger.info(f"Received signal {sig}, shutting down...")
         shutdown_event.set()
     
-    signal.signal(signal.SIGINT, handle_shutdown)
-    signal.signal(signal.SIGTERM, handle_shutdown)
+    # Deliver signals as ordinary loop callbacks; Windows loops lack
+    # add_signal_handler, so fall back to process-level handlers there
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, handle_shutdown, sig)
+        except NotImplementedError:
+            signal.signal(sig, handle_shutdown)
+    
+    components_stopped = False
+    
+    async def stop_components():
+        """Stop the maker and close every stream client (once, idempotent)."""
+        nonlocal components_stopped
+        if components_stopped:
+            return
+        components_stopped = True
+        # The closes are independent socket teardowns, so run them concurrently
+        close_results = await asyncio.gather(
+            maker.stop(),
+            market_ws.close(),
+            user_ws.close(),
+            trading_ws.close(),
+            *([binance_ws.close()] if binance_ws else []),
+            return_exceptions=True,
+        )
+        for result in close_results:
+            if isinstance(result, Exception):
+                logger.warning(f"Error while stopping components: {result}")
+        if telegram_bot:
+            telegram_bot.stop()
     
     try:
-        # Connect WebSockets
-        await market_ws.connect()
+        # Connect WebSockets: independent endpoints, so handshake them
+        # concurrently (trading WS is the primary channel for orders).
+        # Let every connect settle before raising, so none is still running
+        # when the finally block closes the clients.
+        connect_results = await asyncio.gather(
+            market_ws.connect(), user_ws.connect(), trading_ws.connect(),
+            return_exceptions=True,
+        )
+        for result in connect_results:
+            if isinstance(result, BaseException):
+                raise result
         await market_ws.subscribe_price(config.symbol)
+        await referral_task
         
-        await user_ws.connect()
-        
-        # Connect trading WS (for order operations)
-        await trading_ws.connect()
+        # Bound methods used by the per-frame callbacks, looked up once
+        on_dex_price = maker.on_price_update
+        update_imbalance = state.update_imbalance
+        record_state_fill = state.record_fill
+        record_monitor_fill = maker.monitor.record_fill
+        get_order = state.get_order
+        set_order = state.set_order
+        signal_check = maker._pending_check.set
         
         # Register price callback - triggers order checks
         def on_price(data):
-            price_data = data.get("data", {})
-            last_price = price_data.get("last_price")
+            last_price = data.get("data", _EMPTY).get("last_price")
             if last_price:
-                maker.on_price_update(float(last_price))
-                logger.debug(f"Price update: {last_price}")
+                on_dex_price(float(last_price))
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Price update: %s", last_price)
         
         market_ws.on_price(on_price)
         
         # Wire Binance WS Callbacks
         if binance_ws:
-            def on_binance_price(price: float):
-                maker.on_cex_price_update(price)
-                # Note: Dont double confirm price here, handled in maker
-            
-            binance_ws.on_price(on_binance_price)
-            def on_binance_kline(notional: float):
-                maker.on_cex_volume_update(notional)
-            binance_ws.on_kline(on_binance_kline)
+            # Maker handlers take the callback arguments as-is
+            # Note: Dont double confirm price here, handled in maker
+            binance_ws.on_price(maker.on_cex_price_update)
+            binance_ws.on_kline(maker.on_cex_volume_update)
             
             # Register depth callback for imbalance guard
             if config.imbalance_guard_enabled:
+                imbalance_window_sec = config.imbalance_window_sec
                 def on_binance_depth(bid_depth: float, ask_depth: float, imbalance: float):
-                    state.update_imbalance(bid_depth, ask_depth, config.imbalance_window_sec)
+                    update_imbalance(bid_depth, ask_depth, imbalance_window_sec)
                 binance_ws.on_depth(on_binance_depth)
                 logger.info(f"Imbalance Guard enabled: depth_levels={config.imbalance_depth_levels}, window={config.imbalance_window_sec}s")
         
@@ -192,17 +256,21 @@ async def main(config_path: str):
                 logger.error(f"Failed to cancel orphan order {cl_ord_id}: {e}")
         
         def on_order(data):
-            order_data = data.get("data", {})
+            order_data = data.get("data", _EMPTY)
             status = order_data.get("status")
             cl_ord_id = order_data.get("cl_ord_id", "")
             side = order_data.get("side")
+            status_lower = status.lower() if status else ""
             
-            logger.info(f"Order update: cl_ord_id={cl_ord_id}, status={status}, side={side}")
+            # Fires on every order transition including plain 'open' acks; the
+            # consequential ones (fills, clears, orphans) are logged below
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Order update: cl_ord_id=%s, status=%s, side=%s", cl_ord_id, status, side)
             
-            if status and status.lower() in ("filled", "partially_filled", "cancelled", "canceled", "rejected"):
+            if status_lower in _ORDER_UPDATE_STATUSES:
                 # Record fill immediately upon receipt
-                if status.lower() in ("filled", "partially_filled"):
-                    state.record_fill()
+                if status_lower in _FILL_STATUSES:
+                    record_state_fill()
                     
                     # Extract key fill data from StandX order message
                     pnl = float(order_data.get("pnl", 0) or 0)
@@ -233,36 +301,34 @@ async def main(config_path: str):
                     # Capture risk parameters at fill time for diagnosis
                     cex_price = state.last_cex_price or 0
                     dex_price = state.last_dex_price or 0
-                    spread_bps = state.get_spread_bps() if hasattr(state, 'get_spread_bps') else 0
-                    vol_bps = state.get_volatility_bps() if hasattr(state, 'get_volatility_bps') else 0
-                    imbalance = getattr(state, 'last_imbalance', 0)
+                    spread_bps = state.get_spread_bps()
+                    vol_bps = state.get_volatility_bps()
+                    imbalance = state.last_imbalance
                     position = state.position
                     
-                    maker.monitor.record_fill(pnl=pnl, fee=fee)
+                    record_monitor_fill(pnl=pnl, fee=fee)
                     
                     # Detailed fill log with risk context
                     logger.warning(
-                        f"FILL: {cl_ord_id} | {side} {fill_qty}/{order_qty} @ {fill_price} | "
-                        f"PnL=${pnl:.4f} Fee=${fee:.4f} | "
-                        f"CEX={cex_price:.2f} DEX={dex_price:.2f} | "
-                        f"Spread={spread_bps:.1f}bps Vol={vol_bps:.1f}bps Imb={imbalance:.2f} | "
-                        f"Pos={position}"
+                        "FILL: %s | %s %s/%s @ %s | PnL=$%.4f Fee=$%.4f | CEX=%.2f DEX=%.2f | "
+                        "Spread=%.1fbps Vol=%.1fbps Imb=%.2f | Pos=%s",
+                        cl_ord_id, side, fill_qty, order_qty, fill_price, pnl, fee,
+                        cex_price, dex_price, spread_bps, vol_bps, imbalance, position,
                     )
 
                 if side in ("buy", "sell"):
-                    current_order = state.get_order(side)
+                    current_order = get_order(side)
                     
                     
                     
                     # Clear pending cancel tracking when we get WS confirmation
                     if cl_ord_id in maker._pending_cancels:
-                        status_lower = status.lower()
-                        if status_lower in ("cancelled", "canceled", "filled", "rejected"):
+                        if status_lower in _DONE_STATUSES:
                             maker._pending_cancels.pop(cl_ord_id, None)
-                            logger.info(f"Pending cancel cleared (WS {status}): {cl_ord_id}")
+                            logger.info("Pending cancel cleared (WS %s): %s", status, cl_ord_id)
                     
                     # Handle unexpected 'open' status for orders we thought were cancelled
-                    if status.lower() == "open":
+                    if status_lower == "open":
                         if cl_ord_id in maker._pending_cancels:
                             # Order is open but we're trying to cancel it - wait for cancel confirmation
                             logger.warning(f"Order still open while pending cancel: {cl_ord_id}")
@@ -275,10 +341,10 @@ async def main(config_path: str):
                                 asyncio.create_task(cancel_orphan_order(cl_ord_id, side))
                     
                     if current_order and current_order.cl_ord_id == cl_ord_id:
-                        if status.lower() in ("filled", "cancelled", "canceled", "rejected"):
-                            logger.info(f"Order {status}: clearing {side} from state")
-                            state.set_order(side, None)
-                        elif status.lower() == "partially_filled":
+                        if status_lower in _DONE_STATUSES:
+                            logger.info("Order %s: clearing %s from state", status, side)
+                            set_order(side, None)
+                        elif status_lower == "partially_filled":
                             remaining_qty = (
                                 order_data.get("leaves_qty")
                                 or order_data.get("remaining_qty")
@@ -291,29 +357,46 @@ async def main(config_path: str):
                                     pass
                         
                         # Trigger a check to potentially place new order
-                        maker._pending_check.set()
+                        signal_check()
         
         user_ws.on_order(on_order)
         
+        # Raw inputs of the last position frame handled, and the qty it stored
+        last_position_key = None
+        last_position_qty = None
+        last_seen_fill_seq = 0
+        
         # Register position callback to track fills
         def on_position(data):
-            pos_data = data.get("data", {})
-            qty = float(pos_data.get("qty", 0))
+            nonlocal last_position_key, last_position_qty, last_seen_fill_seq
+            pos_data = data.get("data", _EMPTY)
             symbol = pos_data.get("symbol", "")
             
-            pending_price = pos_data.get("entry_price", None)
-            entry_price = float(pending_price) if pending_price is not None else 0.0
-            
             if symbol == config.symbol:
+                previous_qty = state.position
+                last_dex_price = state.last_dex_price
+                
+                raw_mark = pos_data.get("mark_price")
+                key = (
+                    pos_data.get("qty", 0),
+                    pos_data.get("entry_price", None),
+                    raw_mark if raw_mark is not None else last_dex_price,
+                )
+                # Repeated frames (same raw qty / entry / mark, or the same DEX
+                # fallback price) only skip the hidden-fill check and state update,
+                # unless something else has moved State's position since
+                repeated = key == last_position_key and previous_qty == last_position_qty
+                
+                qty = float(key[0])
+                pending_price = key[1]
+                entry_price = float(pending_price) if pending_price is not None else 0.0
+                
                 logger.info(f"Position update: {symbol} qty={qty} @ {entry_price}")
                 
                 # === Real-time Stop Loss Check (reduce HTTP latency) ===
+                # Runs on every frame, repeated or not
                 # Use mark_price from WS if available, fallback to state.last_dex_price
-                mark_price = pos_data.get("mark_price")
-                if mark_price is not None:
-                    mark_price = float(mark_price)
-                else:
-                    mark_price = state.last_dex_price or 0.0
+                mark_price = float(raw_mark) if raw_mark is not None else (last_dex_price or 0.0)
                 
                 if mark_price > 0 and entry_price > 0 and qty != 0:
                     should_stop = maker.check_stop_loss_from_ws(qty, entry_price, mark_price)
@@ -322,19 +405,22 @@ async def main(config_path: str):
                         # Schedule stop loss execution as async task
                         asyncio.create_task(maker._check_stop_loss())
                 
+                if repeated:
+                    return
+                
                 # Check for position change to detect hidden fills
-                previous_qty = state.position
                 if abs(qty - previous_qty) > 1e-6:
                      # Position changed -> implies a trade happened
-                     # We record it only if it wasn't just recorded by on_order (heuristic)
-                     import time
-                     time_since_last_fill = time.time() - state.last_fill_time
-                     if time_since_last_fill > 1.0: # If > 1s since last order-based fill record
+                     # We record it only if on_order hasn't recorded a fill since the last position frame
+                     if state.fill_seq == last_seen_fill_seq:
                          logger.info(f"Fill detected via Position Change: {previous_qty} -> {qty}")
                          state.record_fill()
                          maker.monitor.record_fill()
+                last_seen_fill_seq = state.fill_seq
                 
                 state.update_position(qty, entry_price)
+                last_position_key = key
+                last_position_qty = state.position
         
         user_ws.on_position(on_position)
 
@@ -343,18 +429,39 @@ async def main(config_path: str):
         await maker.initialize()
 
         # Background task to sync stats
-        async def sync_stats_task(interval: int = 60):
-            logger.info(f"Starting stats sync task (interval={interval}s)")
-            from datetime import datetime
+        async def sync_stats_task(interval: int = 60, min_interval: int = 15, max_interval: int = 300):
+            logger.info(f"Starting stats sync task (interval={interval}s, adaptive {min_interval}-{max_interval}s)")
+            synced_fill_seq = state.fill_seq
             
             while not shutdown_event.is_set():
                 try:
-                    await asyncio.sleep(interval)
-                    if shutdown_event.is_set(): break
+                    # Wake on shutdown immediately instead of sleeping out the interval
+                    try:
+                        await asyncio.wait_for(shutdown_event.wait(), timeout=interval)
+                        break
+                    except asyncio.TimeoutError:
+                        pass
+                    
+                    # Sync sooner while fills are coming in, back off while quiet
+                    # (max_interval matches the default efficiency report interval)
+                    if state.fill_seq != synced_fill_seq:
+                        interval = max(min_interval, interval // 2)
+                    else:
+                        interval = min(max_interval, interval * 2)
+                    synced_fill_seq = state.fill_seq
 
-                    # 1. Query Balance (Equity)
+                    # Balance (equity) and orders (fills & PnL) are independent queries
+                    bal_res, orders = await asyncio.gather(
+                        http_client.query_balance(),
+                        # query_history_orders maps to /api/query_orders
+                        http_client.query_history_orders(limit=100),
+                        return_exceptions=True,
+                    )
+
+                    # 1. Balance (Equity)
                     try:
-                        bal_res = await http_client.query_balance()
+                        if isinstance(bal_res, BaseException):
+                            raise bal_res
                         data = bal_res.get("data", {})
                         equity = float(data.get("equity", 0))
                         balance = float(data.get("balance", 0))
@@ -363,29 +470,22 @@ async def main(config_path: str):
                         equity = 0.0
                         balance = 0.0
 
-                    # 2. Query Orders (Fills & PnL in current report window)
+                    # 2. Orders (Fills & PnL in current report window)
                     try:
-                        # Use query_history_orders which maps to /api/query_orders
-                        orders = await http_client.query_history_orders(limit=100)
+                        if isinstance(orders, BaseException):
+                            raise orders
                         
-                        # EfficiencyMonitor uses _last_report_time.
-                        window_start = maker.monitor._last_report_time
+                        # Wall-clock start of the current EfficiencyMonitor report window
+                        window_start = maker.monitor.report_window_start
                         
                         fills_count = 0
                         realized_pnl = 0.0
                         
                         for o in orders:
-                            if o.status in ("filled", "partially_filled"):
-                                try:
-                                    t_str = o.updated_at.replace("Z", "+00:00")
-                                    dt = datetime.fromisoformat(t_str)
-                                    ts = dt.timestamp()
-                                    
-                                    if ts >= window_start:
-                                        fills_count += 1
-                                        realized_pnl += o.realized_pnl
-                                except Exception:
-                                    pass
+                            # updated_ts is parsed once by the HTTP client (0.0 if unparseable)
+                            if o.status in _FILL_STATUSES and o.updated_ts >= window_start:
+                                fills_count += 1
+                                realized_pnl += o.realized_pnl
                                     
                         maker.monitor.update_synced_stats(fills_count, realized_pnl, equity, balance)
                         
@@ -423,14 +523,7 @@ async def main(config_path: str):
         )
         
         # Stop all running components first
-        await maker.stop()
-        await market_ws.close()
-        await user_ws.close()
-        await trading_ws.close()
-        if binance_ws:
-            await binance_ws.close()
-        if telegram_bot:
-            telegram_bot.stop()
+        await stop_components()
         
         # Cancel pending tasks with timeout
         for task in pending:
@@ -441,14 +534,18 @@ async def main(config_path: str):
             await asyncio.wait(pending, timeout=3.0)
         
     finally:
+        # Also reached when startup fails part-way (e.g. a WS connect error),
+        # so the referral task is not left running and sockets that did open
+        # are still closed
+        if not referral_task.done():
+            referral_task.cancel()
+            await asyncio.gather(referral_task, return_exceptions=True)
+        await stop_components()
+        
         # Cancel all open orders on exit
         logger.info("Cleaning up...")
         try:
-            orders_to_cancel = []
-            if state.has_order("buy"):
-                orders_to_cancel.append(state.get_order("buy").cl_ord_id)
-            if state.has_order("sell"):
-                orders_to_cancel.append(state.get_order("sell").cl_ord_id)
+            orders_to_cancel = [cl_ord_id for cl_ord_id in state.snapshot_open_order_ids() if cl_ord_id]
             
             if orders_to_cancel:
                 logger.info(f"Cancelling {len(orders_to_cancel)} orders on exit: {orders_to_cancel}")
@@ -473,6 +570,16 @@ def parse_args():
     return parser.parse_args()
 
 
+def run(coro):
+    """Run the bot on uvloop when available (not supported on Windows)."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+        return runner.run(coro)
+
+
 if __name__ == "__main__":
     args = parse_args()
-    asyncio.run(main(args.config))
+    run(main(args.config))
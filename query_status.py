@@ -14,40 +14,37 @@ from config import load_config
 from api.auth import StandXAuth
 
 
-async def query_trading_points(auth: StandXAuth) -> dict:
+async def query_trading_points(auth: StandXAuth, client: httpx.AsyncClient) -> dict:
     """Query trading campaign points (Trader Points)."""
     url = "https://api.standx.com/v1/offchain/trading-campaign/points"
     headers = {"Authorization": f"Bearer {auth.token}", "Accept": "application/json"}
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.get(url, headers=headers)
-        response.raise_for_status()
-        return response.json()
+    response = await client.get(url, headers=headers)
+    response.raise_for_status()
+    return response.json()
 
 
-async def query_maker_points(auth: StandXAuth) -> dict:
+async def query_maker_points(auth: StandXAuth, client: httpx.AsyncClient) -> dict:
     """Query maker campaign points (Maker Points)."""
     url = "https://api.standx.com/v1/offchain/maker-campaign/points"
     headers = {"Authorization": f"Bearer {auth.token}", "Accept": "application/json"}
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.get(url, headers=headers)
-        response.raise_for_status()
-        return response.json()
+    response = await client.get(url, headers=headers)
+    response.raise_for_status()
+    return response.json()
 
 
-async def query_perps_points(auth: StandXAuth) -> dict:
+async def query_perps_points(auth: StandXAuth, client: httpx.AsyncClient) -> dict:
     """Query perps campaign points (Holder Points)."""
     url = "https://api.standx.com/v1/offchain/perps-campaign/points"
     headers = {"Authorization": f"Bearer {auth.token}", "Accept": "application/json"}
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.get(url, headers=headers)
-        response.raise_for_status()
-        return response.json()
+    response = await client.get(url, headers=headers)
+    response.raise_for_status()
+    return response.json()
 
 
-async def query_uptime(auth: StandXAuth) -> dict:
+async def query_uptime(auth: StandXAuth, client: httpx.AsyncClient) -> dict:
     """Query maker uptime hours."""
     url = "https://perps.standx.com/api/maker/uptime"
     
@@ -56,22 +53,20 @@ async def query_uptime(auth: StandXAuth) -> dict:
     headers = auth.get_auth_headers(payload)
     headers["Accept"] = "application/json"
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.get(url, headers=headers)
-        response.raise_for_status()
-        return response.json()
+    response = await client.get(url, headers=headers)
+    response.raise_for_status()
+    return response.json()
 
 
-async def query_balance(auth: StandXAuth) -> dict:
+async def query_balance(auth: StandXAuth, client: httpx.AsyncClient) -> dict:
     """Query account balance and equity."""
     url = "https://perps.standx.com/api/query_balance"
     headers = auth.get_auth_headers()
     headers["Accept"] = "application/json"
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.get(url, headers=headers)
-        response.raise_for_status()
-        return response.json()
+    response = await client.get(url, headers=headers)
+    response.raise_for_status()
+    return response.json()
 
 
 def format_points(value) -> str:
@@ -101,17 +96,19 @@ def format_hour(iso_time: str) -> str:
         return iso_time[:16]
 
 
+_TIER_NAMES = {
+    "tier_a": "Green",
+    "tier_b": "Light Green",
+    "tier_c": "Yellow",
+    "tier_d": "Gray",
+    "": "Gray",
+    None: "Gray",
+}
+
+
 def tier_to_name(tier: str) -> str:
     """Convert tier code to display name."""
-    tier_map = {
-        "tier_a": "Green",
-        "tier_b": "Light Green",
-        "tier_c": "Yellow",
-        "tier_d": "Gray",
-        "": "Gray",
-        None: "Gray",
-    }
-    return tier_map.get(tier, tier or "Gray")
+    return _TIER_NAMES.get(tier, tier or "Gray")
 
 
 async def main(config_path: str):
@@ -126,37 +123,27 @@ async def main(config_path: str):
     await auth.authenticate(config.wallet.chain, config.wallet.private_key)
     print("Authentication successful\n")
     
-    # Query all data
-    trading_data = {}
-    maker_data = {}
-    perps_data = {}
-    uptime_data = {}
-    
-    try:
-        trading_data = await query_trading_points(auth)
-    except Exception as e:
-        print(f"Warning: Failed to query trading points: {e}")
-    
-    try:
-        maker_data = await query_maker_points(auth)
-    except Exception as e:
-        print(f"Warning: Failed to query maker points: {e}")
+    # Query all data (independent endpoints, one shared client)
+    queries = (
+        ("trading points", query_trading_points),
+        ("maker points", query_maker_points),
+        ("perps points", query_perps_points),
+        ("uptime", query_uptime),
+        ("balance", query_balance),
+    )
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        results = await asyncio.gather(
+            *(query(auth, client) for _, query in queries),
+            return_exceptions=True,
+        )
     
-    try:
-        perps_data = await query_perps_points(auth)
-    except Exception as e:
-        print(f"Warning: Failed to query perps points: {e}")
+    for (name, _), result in zip(queries, results):
+        if isinstance(result, Exception):
+            print(f"Warning: Failed to query {name}: {result}")
     
-    try:
-        uptime_data = await query_uptime(auth)
-    except Exception as e:
-        print(f"Warning: Failed to query uptime: {e}")
-    
-    balance_data = {}
-    try:
-        balance_data = await query_balance(auth)
-    except Exception as e:
-        print(f"Warning: Failed to query balance: {e}")
+    trading_data, maker_data, perps_data, uptime_data, balance_data = (
+        {} if isinstance(result, Exception) else result for result in results
+    )
     
     # Display Account Summary
     print("=" * 60)
@@ -202,7 +189,8 @@ async def main(config_path: str):
     print(f"{'Time':<18} {'Tier':<14} {'Eligible':<10} {'P70':<10} {'P50':<10}")
     print("-" * 60)
     
-    # Reverse to show most recent first
+    # Reverse to show most recent first; the table is written in one print
+    rows = []
     for h in reversed(hours):
         time_str = format_hour(h.get("hour", ""))
         tier = tier_to_name(h.get("tier", ""))
@@ -210,9 +198,10 @@ async def main(config_path: str):
         x70 = h.get("x70", 0)
         x50 = h.get("x50", 0)
         
-        print(f"{time_str:<18} {tier:<14} {eligible:<10.4f} {x70:<10.4f} {x50:<10.4f}")
+        rows.append(f"{time_str:<18} {tier:<14} {eligible:<10.4f} {x70:<10.4f} {x50:<10.4f}")
     
-    print("-" * 60)
+    rows.append("-" * 60)
+    print("\n".join(rows))
 
 
 def parse_args():
@@ -78,12 +78,16 @@ async def main_async():
     log_file = "efficiency.log" # Assumed in current dir
     
     logger.info(f"Generating report for last {args.hours} hours...")
-    stats = parse_efficiency_log(log_file, args.hours)
+    # Auth + balance query is network-bound and independent of the log,
+    # so it runs while the log is parsed in a worker thread
+    balance_task = asyncio.create_task(get_balance(config))
+    stats = await asyncio.to_thread(parse_efficiency_log, log_file, args.hours)
     
     if stats:
-        # Query balance
-        balance_data = await get_balance(config)
+        balance_data = await balance_task
         await send_telegram_report(stats, config, args.hours, balance_data)
+    else:
+        balance_task.cancel()
 
 def main():
     asyncio.run(main_async())
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """Test script to verify Binance WS price data reception."""
 import asyncio
-import json
+
+import orjson
 import websockets
 
 SYMBOL = "btcusdt"
@@ -18,7 +19,7 @@ async def main():
         
         while count < 50:  # Check 50 messages
             message = await ws.recv()
-            data = json.loads(message)
+            data = orjson.loads(message)
             
             # Handle flat format (no stream wrapper)
             if "stream" in data: